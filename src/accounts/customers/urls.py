@@ -12,6 +12,11 @@ urlpatterns = [
         view=carts_views.CartItemListCreateDelete().as_view(),
         name="cart_items",
     ),
+    path(
+        "<int:pk>/cart-summary",
+        view=carts_views.CartSummaryView().as_view(),
+        name="cart_summary",
+    ),
     path(
         "<int:pk>/cart-items/<int:cart_item_pk>",
         view=carts_views.CartItemDetail().as_view(),
@@ -43,4 +48,14 @@ urlpatterns = [
         view=orders_views.CustomerOrderListView().as_view(),
         name="orders",
     ),
+    path(
+        "<int:pk>/checkout",
+        view=orders_views.CheckoutView().as_view(),
+        name="checkout",
+    ),
+    path(
+        "<int:pk>/orders/export",
+        view=orders_views.CustomerOrderExportView().as_view(),
+        name="orders_export",
+    ),
 ]
@@ -27,4 +27,7 @@ urlpatterns = [
     path("<int:pk>/products/<int:product_pk>",
          view=views.ProductDetailUpdateDeleteView().as_view(),
          name="product"),
+    path("<int:pk>/sales",
+         view=views.DistributorSalesView().as_view(),
+         name="sales"),
 ]
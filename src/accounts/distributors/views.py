@@ -17,6 +17,11 @@ from products.serializers import (
     ProductOutSerializer,
 )
 from products.models import Product
+from orders.services import OrderSelector
+from orders.serializers import (
+    DistributorSalesOutSerializer,
+    DistributorSalesQueryParametersSerializer,
+)
 
 
 class DistributorBrandsView(APIView):
@@ -66,7 +71,7 @@ class DistributorProductListView(APIView):
             inventory__store__distributor_id=distributor_pk, ordering=["-id"], is_active=True
         ).distinct("id")
         paginator = ProductPagination()
-        products = products.prefetch_related("brand")
+        products = selector.with_list_related(products)
         paginated_dataset = paginator.paginate_queryset(products, request)
         serializer = ProductListOutSerializer(
             paginated_dataset, many=True, context={"request": request}
@@ -127,3 +132,23 @@ class ProductDetailUpdateDeleteView(APIView):
         service.delete(product)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class DistributorSalesView(APIView):
+    permission_classes = [IsAuthenticated, DistributorsOnly]
+
+    def get(self, request, **kwargs):
+        distributor_pk = kwargs["pk"]
+        if request.user.pk != distributor_pk:
+            raise PermissionDenied("Access to this resource is denied")
+
+        query_params = DistributorSalesQueryParametersSerializer(
+            data=request.query_params
+        )
+        query_params.is_valid(raise_exception=True)
+
+        selector = OrderSelector()
+        sales = selector.daily_sales(distributor_pk, **query_params.validated_data)
+        data = DistributorSalesOutSerializer(sales, many=True).data
+
+        return Response(data)
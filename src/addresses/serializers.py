@@ -1,5 +1,5 @@
-from django.urls import reverse
 from rest_framework import serializers
+from common.api.links import get_link_builder
 from .models import Store, PickupAddress, Governorate
 
 
@@ -32,12 +32,11 @@ class StoreOutSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        self_url = reverse(
-            "distributors:store",
-            kwargs={"pk": data["distributor_id"], "store_pk": data["id"]},
-        )
+        link_builder = get_link_builder(self.context)
         links = {
-            "self": self.context["request"].build_absolute_uri(self_url),
+            "self": link_builder.build(
+                "distributors:store", pk=data["distributor_id"], store_pk=data["id"]
+            ),
         }
 
         data["_links"] = links
@@ -62,11 +61,12 @@ class PickupAddressOutSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         data = super().to_representation(instance)
         governorate = Governorate.objects.get(pk=instance.city.governorate_id)
-        self_url = reverse(
-            "customers:address",
-            kwargs={"pk": instance.customer_id, "address_pk": instance.pk},
-        )
-        links = {"self": self.context["request"].build_absolute_uri(self_url)}
+        link_builder = get_link_builder(self.context)
+        links = {
+            "self": link_builder.build(
+                "customers:address", pk=instance.customer_id, address_pk=instance.pk
+            )
+        }
         data["governorate"] = governorate.name
         data["governorate_id"] = governorate.pk
         data["_links"] = links
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.15 on 2026-10-18 10:27
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('brands', '0003_brand_name_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='brand',
+            name='brand_name_trgm_idx',
+        ),
+        migrations.AddIndex(
+            model_name='brand',
+            index=models.Index(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='text_pattern_ops'), name='brand_name_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='brand',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.search.SearchVector('name', config='simple'), name='brand_name_words_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models.functions import Upper
 from accounts.models import Distributor
 
 
@@ -10,6 +13,18 @@ class Brand(models.Model):
         through_fields=("brand", "distributor"),
     )
 
+    class Meta:
+        indexes = [
+            # name suggestions, see the product name indexes
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="brand_name_prefix_idx",
+            ),
+            GinIndex(
+                SearchVector("name", config="simple"), name="brand_name_words_idx"
+            ),
+        ]
+
     def __str__(self) -> str:
         return self.name
 
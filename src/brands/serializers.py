@@ -1,5 +1,5 @@
-from django.urls import reverse
 from rest_framework import serializers
+from common.api.links import get_link_builder
 from .models import Brand
 
 
@@ -13,11 +13,10 @@ class BrandOutSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         data = super().to_representation(instance)
 
-        brand_url = reverse("brands:brand", kwargs={'pk': data['id']})
-        applications_collection = reverse("brands:brand_applications", kwargs={'pk': data['id']})
+        link_builder = get_link_builder(self.context)
         links = {
-            'self': self.context['request'].build_absolute_uri(brand_url),
-            # 'collection/applications': self.context['request'].build_absolute_uri(applications_collection),
+            'self': link_builder.build("brands:brand", pk=data['id']),
+            # 'collection/applications': link_builder.build("brands:brand_applications", pk=data['id']),
             # 'collection/distributors'
         }
 
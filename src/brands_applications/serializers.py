@@ -1,5 +1,5 @@
-from django.urls import reverse
 from rest_framework import serializers
+from common.api.links import get_link_builder
 from .models import BrandApplication
 
 
@@ -40,13 +40,12 @@ class BrandApplicationOutSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        self_url = reverse(
-            "brand_applications:brand_application", kwargs={"pk": data["id"]}
-        )
-        brand_url = reverse("brands:brand", kwargs={"pk": data["brand_id"]})
+        link_builder = get_link_builder(self.context)
         links = {
-            "self": self.context["request"].build_absolute_uri(self_url),
-            "brand": self.context["request"].build_absolute_uri(brand_url),
+            "self": link_builder.build(
+                "brand_applications:brand_application", pk=data["id"]
+            ),
+            "brand": link_builder.build("brands:brand", pk=data["brand_id"]),
         }
 
         data["_links"] = links
@@ -75,13 +74,12 @@ class BrandApplicationListOutSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        self_url = reverse(
-            "brand_applications:brand_application", kwargs={"pk": data["id"]}
-        )
-        brand_url = reverse("brands:brand", kwargs={"pk": data["brand_id"]})
+        link_builder = get_link_builder(self.context)
         links = {
-            "self": self.context["request"].build_absolute_uri(self_url),
-            "brand": self.context["request"].build_absolute_uri(brand_url),
+            "self": link_builder.build(
+                "brand_applications:brand_application", pk=data["id"]
+            ),
+            "brand": link_builder.build("brands:brand", pk=data["brand_id"]),
         }
 
         data["_links"] = links
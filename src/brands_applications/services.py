@@ -3,7 +3,7 @@ from django.core.files import File
 from brands.services import BrandSelector, BrandService
 from common.api.exceptions import Conflict
 from common.validators import validate_file_format, validate_file_size
-from utils.storage import SupabaseStorageService
+from utils.storage import get_storage_service
 from utils.helpers import generate_dated_filepath, hash_filename
 from .models import BrandApplication
 
@@ -12,7 +12,7 @@ class BrandApplicationService:
     def __init__(self) -> None:
         self.selector = BrandApplicationSelector()
         self.brand_service = BrandService()
-        self.supabase = SupabaseStorageService()
+        self.storage = get_storage_service()
 
     def create(
         self, authorization_doc: File, identity_doc: File, **app_data
@@ -56,7 +56,7 @@ class BrandApplicationService:
 class BrandApplicationSelector:
     def __init__(self) -> None:
         self.brand_selector = BrandSelector()
-        self.supabase = SupabaseStorageService()
+        self.storage = get_storage_service()
 
     def brand_application_list(self, **filters):
         result = BrandApplication.objects.filter(**filters)
@@ -0,0 +1,233 @@
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+from products.models import Product
+from .models import CartItem
+
+
+def get_cart_backend() -> "CartBackend":
+    return import_string(settings.CART_BACKEND)()
+
+
+class CartBackend:
+    """
+    Storage of the customers carts. Items are addressed by product id, the
+    products are validated by the cart service before reaching the backend.
+    """
+
+    def add(self, customer_pk: int, product_ids: List[int], quantity: int) -> Dict[int, str]:
+        """Add the products to the cart, products already in the cart get
+        their quantity incremented. Return the outcome per product id,
+        "created" or "incremented" """
+        raise NotImplementedError
+
+    def set_quantity(self, customer_pk: int, product_id: int, quantity: int):
+        raise NotImplementedError
+
+    def remove(self, customer_pk: int, product_id: int):
+        raise NotImplementedError
+
+    def clear(self, customer_pk: int):
+        raise NotImplementedError
+
+    def get_items(self, customer_pk: int, select_products: bool = False) -> List[CartItem]:
+        """Cart items ordered by their addition, with their products loaded
+        and the items of deleted products left out if `select_products`"""
+        raise NotImplementedError
+
+    def get_item_by_id(
+        self, customer_pk: int, cart_item_pk: int
+    ) -> Optional[CartItem]:
+        """The cart item by the id of its database row with its current
+        quantity, None if it's not in the cart"""
+        raise NotImplementedError
+
+    def flush(self, customer_pk: int):
+        """Persist the cart to the database"""
+        raise NotImplementedError
+
+
+class DatabaseCartBackend(CartBackend):
+    def add(self, customer_pk, product_ids, quantity):
+        values = ", ".join(["(%s, %s, %s)"] * len(product_ids))
+        params = []
+        for product_id in product_ids:
+            params.extend([product_id, customer_pk, quantity])
+        with connection.cursor() as cursor:
+            # xmax is 0 only for the rows inserted by this statement
+            cursor.execute(
+                f"""
+                INSERT INTO carts_cartitem (product_id, customer_id, quantity)
+                VALUES {values}
+                ON CONFLICT (product_id, customer_id) DO UPDATE
+                SET quantity = carts_cartitem.quantity + EXCLUDED.quantity
+                RETURNING product_id, xmax = 0
+                """,
+                params,
+            )
+            return {
+                product_id: "created" if inserted else "incremented"
+                for product_id, inserted in cursor.fetchall()
+            }
+
+    def set_quantity(self, customer_pk, product_id, quantity):
+        CartItem.objects.filter(customer_id=customer_pk, product_id=product_id).update(
+            quantity=quantity
+        )
+
+    def remove(self, customer_pk, product_id):
+        CartItem.objects.filter(customer_id=customer_pk, product_id=product_id).delete()
+
+    def clear(self, customer_pk):
+        CartItem.objects.filter(customer_id=customer_pk).delete()
+
+    def get_items(self, customer_pk, select_products=False):
+        cart_items = CartItem.objects.filter(customer_id=customer_pk).order_by("id")
+        if select_products:
+            cart_items = cart_items.select_related("product")
+        return list(cart_items)
+
+    def get_item_by_id(self, customer_pk, cart_item_pk):
+        return CartItem.objects.filter(pk=cart_item_pk, customer_id=customer_pk).first()
+
+    def flush(self, customer_pk):
+        pass
+
+
+class CacheCartBackend(CartBackend):
+    """
+    Keeps the carts in the cache and writes them to the database on flush,
+    at checkout. Carts are read from the database on a cache miss, the items
+    not flushed yet have no id. Concurrent writes to
+    the same cart are last write wins, and an evicted unflushed cart is
+    lost, so a persistent cache should back it in production.
+    """
+
+    key_prefix = "cart"
+
+    def add(self, customer_pk, product_ids, quantity):
+        cart = self._get_cart(customer_pk)
+        outcomes = {}
+        for product_id in product_ids:
+            key = str(product_id)
+            outcomes[product_id] = "incremented" if key in cart["items"] else "created"
+            cart["items"][key] = cart["items"].get(key, 0) + quantity
+        self._set_cart(customer_pk, cart, dirty=True)
+        return outcomes
+
+    def set_quantity(self, customer_pk, product_id, quantity):
+        cart = self._get_cart(customer_pk)
+        if str(product_id) in cart["items"]:
+            cart["items"][str(product_id)] = quantity
+            self._set_cart(customer_pk, cart, dirty=True)
+
+    def remove(self, customer_pk, product_id):
+        cart = self._get_cart(customer_pk)
+        if cart["items"].pop(str(product_id), None) is not None:
+            self._set_cart(customer_pk, cart, dirty=True)
+
+    def clear(self, customer_pk):
+        self._set_cart(customer_pk, {"items": {}, "ids": {}}, dirty=True)
+
+    def get_items(self, customer_pk, select_products=False):
+        cart = self._get_cart(customer_pk)
+        cart_items = [
+            CartItem(
+                id=cart["ids"].get(product_id),
+                customer_id=customer_pk,
+                product_id=int(product_id),
+                quantity=quantity,
+            )
+            for product_id, quantity in cart["items"].items()
+        ]
+        if select_products:
+            products = Product.objects.filter(is_active=True).in_bulk(
+                [cart_item.product_id for cart_item in cart_items]
+            )
+            cart_items = [
+                cart_item for cart_item in cart_items
+                if cart_item.product_id in products
+            ]
+            for cart_item in cart_items:
+                cart_item.product = products[cart_item.product_id]
+        return cart_items
+
+    def get_item_by_id(self, customer_pk, cart_item_pk):
+        cart = self._get_cart(customer_pk)
+        for product_id, cart_item_id in cart["ids"].items():
+            if cart_item_id == cart_item_pk and product_id in cart["items"]:
+                return CartItem(
+                    id=cart_item_pk,
+                    customer_id=customer_pk,
+                    product_id=int(product_id),
+                    quantity=cart["items"][product_id],
+                )
+        return None
+
+    def flush(self, customer_pk):
+        cart = self._get_cart(customer_pk)
+        if not cart["dirty"]:
+            return
+        items = {int(product_id): quantity for product_id, quantity in cart["items"].items()}
+        # products deleted while the cart was cached are dropped, the
+        # product deletion removed their cart items from the database only
+        active_ids = set(
+            Product.objects.filter(id__in=items, is_active=True).values_list("id", flat=True)
+        )
+        items = {
+            product_id: quantity for product_id, quantity in items.items()
+            if product_id in active_ids
+        }
+        with transaction.atomic():
+            CartItem.objects.filter(customer_id=customer_pk).exclude(
+                product_id__in=items
+            ).delete()
+            ids = {}
+            if items:
+                values = ", ".join(["(%s, %s, %s)"] * len(items))
+                params = []
+                for product_id, quantity in items.items():
+                    params.extend([product_id, customer_pk, quantity])
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        INSERT INTO carts_cartitem (product_id, customer_id, quantity)
+                        VALUES {values}
+                        ON CONFLICT (product_id, customer_id) DO UPDATE
+                        SET quantity = EXCLUDED.quantity
+                        RETURNING product_id, id
+                        """,
+                        params,
+                    )
+                    ids = {
+                        str(product_id): cart_item_id
+                        for product_id, cart_item_id in cursor.fetchall()
+                    }
+        cart["items"] = {str(product_id): quantity for product_id, quantity in items.items()}
+        cart["ids"] = ids
+        self._set_cart(customer_pk, cart, dirty=False)
+
+    def _key(self, customer_pk: int) -> str:
+        return f"{self.key_prefix}:{customer_pk}"
+
+    def _get_cart(self, customer_pk: int) -> Dict:
+        """The cached cart, `items` maps the product ids to their quantities
+        in the order they were added and `ids` to the ids of their database
+        rows, as of the last flush"""
+        cart = cache.get(self._key(customer_pk))
+        if cart is None:
+            cart_items = CartItem.objects.filter(customer_id=customer_pk).order_by("id")
+            cart = {"items": {}, "ids": {}, "dirty": False}
+            for cart_item_id, product_id, quantity in cart_items.values_list(
+                "id", "product_id", "quantity"
+            ):
+                cart["items"][str(product_id)] = quantity
+                cart["ids"][str(product_id)] = cart_item_id
+            cache.set(self._key(customer_pk), cart, settings.CART_CACHE_TIMEOUT)
+        return cart
+
+    def _set_cart(self, customer_pk: int, cart: Dict, dirty: bool):
+        cart["dirty"] = dirty
+        cache.set(self._key(customer_pk), cart, settings.CART_CACHE_TIMEOUT)
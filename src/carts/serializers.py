@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from products.serializers import ProductListOutSerializer
+from products.serializers import ProductCardField, ProductCardListSerializer
 from . import models
 
 
@@ -8,14 +8,34 @@ class CartItemInputSerializer(serializers.Serializer):
 
 
 class CartItemOutSerializer(serializers.ModelSerializer):
-    product = ProductListOutSerializer()
+    product = ProductCardField()
     class Meta:
         model = models.CartItem
         fields = ['id', 'product', 'customer_id', 'quantity']
+        list_serializer_class = ProductCardListSerializer
+
+    def get_product_ids(self, instance):
+        return [instance.product_id]
 
     # def to_representation(self, instance):
     #     pass
 
+class CartSummaryItemOutSerializer(serializers.Serializer):
+    id = serializers.IntegerField(allow_null=True)
+    product_id = serializers.IntegerField()
+    product_name = serializers.CharField()
+    unit_price = serializers.DecimalField(max_digits=9, decimal_places=2)
+    quantity = serializers.IntegerField()
+    available_quantity = serializers.IntegerField()
+    is_active = serializers.BooleanField()
+    line_total = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class CartSummaryOutSerializer(serializers.Serializer):
+    cart_items = CartSummaryItemOutSerializer(many=True)
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
 class CartItemUpdateInputSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.CartItem
@@ -1,51 +1,90 @@
-from typing import List
-from common.api.exceptions import Conflict
+from typing import Dict, List, Optional
+from django.core.exceptions import ValidationError
+from products.services import ProductSelector
+from .backends import get_cart_backend
 from . import models
 
 
 class CartItemService:
     def __init__(self) -> None:
         self.selector = CartItemSelector()
+        self.product_selector = ProductSelector()
+        self.backend = get_cart_backend()
 
     def bulk_create(
         self, product_ids: List[int], customer_id: int, quantity: int = 1
-    ) -> None:
-        if self.selector.cart_item_exist(
-            product_id__in=product_ids, customer_id=customer_id
-        ):
-            raise Conflict("This Cart Item already exists!")
-
-        cart_items = []
-        for product_id in product_ids:
-
-            new_cart_item = models.CartItem(
-                product_id=product_id, customer_id=customer_id, quantity=quantity
-            )
-            new_cart_item.full_clean()
-            cart_items.append(new_cart_item)
-        
-        cart_items = models.CartItem.objects.bulk_create(cart_items)
-    
-        return cart_items
+    ) -> Dict[int, str]:
+        """Add the products to the cart, products already in the cart get
+        their quantity incremented. Return the outcome per product id,
+        "created" or "incremented" """
+        if quantity < 1:
+            raise ValidationError("Quantity must be at least 1")
+        product_ids = list(dict.fromkeys(product_ids))
+        self.product_selector.validate_product_ids(product_ids)
+        return self.backend.add(customer_id, product_ids, quantity)
 
     def update_quantity(self, cart_item: models.CartItem, quantity: int):
         cart_item.quantity = quantity
-        cart_item.full_clean()
-        cart_item.save()
-    
+        cart_item.full_clean(exclude=["product", "customer"], validate_unique=False)
+        self.backend.set_quantity(cart_item.customer_id, cart_item.product_id, quantity)
+
     def cart_item_delete(self, cart_item: models.CartItem):
-        cart_item.delete()
+        self.backend.remove(cart_item.customer_id, cart_item.product_id)
 
     def clear_cart(self, customer_pk: int):
-        models.CartItem.objects.filter(customer_id=customer_pk).delete()
-        
+        self.backend.clear(customer_pk)
+
+    def flush(self, customer_pk: int):
+        """Persist the cart, needed before reading its items from the
+        database"""
+        self.backend.flush(customer_pk)
+
 
 class CartItemSelector:
+    def __init__(self) -> None:
+        self.backend = get_cart_backend()
+
     def cart_item_exist(self, **filters) -> bool:
         is_exist = models.CartItem.objects.filter(**filters).exists()
         return is_exist
 
     def cart_item_list(self, **filters):
         cart_items = models.CartItem.objects.filter(**filters)
-        return cart_items        
+        return cart_items
+
+    def cart_items(self, customer_pk: int) -> List[models.CartItem]:
+        """Items of the cart, the items not flushed yet have no id"""
+        return self.backend.get_items(customer_pk, select_products=True)
+
+    def get_cart_item(
+        self, customer_pk: int, cart_item_pk: int
+    ) -> Optional[models.CartItem]:
+        return self.backend.get_item_by_id(customer_pk, cart_item_pk)
+
+    def cart_summary(self, customer_pk: int) -> Dict:
+        """Cart lines with their price, available stock and total, and the
+        total of the purchasable lines. Lines not flushed yet have no id"""
+        cart_items = []
+        for cart_item in self.backend.get_items(customer_pk, select_products=True):
+            product = cart_item.product
+            cart_items.append(
+                {
+                    "id": cart_item.id,
+                    "product_id": cart_item.product_id,
+                    "quantity": cart_item.quantity,
+                    "product_name": product.name,
+                    "unit_price": product.price,
+                    "is_active": product.is_active,
+                    "available_quantity": (
+                        product.total_quantity - product.reserved_quantity
+                    ),
+                    "line_total": cart_item.quantity * product.price,
+                }
+            )
+        total_price = sum(
+            item["line_total"]
+            for item in cart_items
+            if item["is_active"] and item["quantity"] <= item["available_quantity"]
+        )
+        return {"cart_items": cart_items, "total_price": total_price}
 
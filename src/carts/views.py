@@ -1,17 +1,16 @@
-from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import NotFound, PermissionDenied
 from common.api.permissions import CustomersOnly
 from .serializers import (
     CartItemInputSerializer,
     CartItemOutSerializer,
     CartItemUpdateInputSerializer,
+    CartSummaryOutSerializer,
 )
 from .services import CartItemService, CartItemSelector
-from .models import CartItem
 
 
 class CartItemListCreateDelete(APIView):
@@ -27,10 +26,18 @@ class CartItemListCreateDelete(APIView):
         serializer = CartItemInputSerializer(data=request.data)
         serializer.is_valid()
         service = CartItemService()
-        service.bulk_create(**serializer.validated_data, customer_id=customer_pk)
+        outcomes = service.bulk_create(
+            **serializer.validated_data, customer_id=customer_pk
+        )
 
         return Response(
-            data={"message": "Cart item added successfully"},
+            data={
+                "message": "Cart item added successfully",
+                "results": [
+                    {"product_id": product_id, "status": outcome}
+                    for product_id, outcome in outcomes.items()
+                ],
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -40,8 +47,7 @@ class CartItemListCreateDelete(APIView):
             raise PermissionDenied("Can't access cart Items of another user")
 
         selector = CartItemSelector()
-        cart_items = selector.cart_item_list(customer_id=customer_pk)
-        cart_items.prefetch_related("product")
+        cart_items = selector.cart_items(customer_pk)
         serializer = CartItemOutSerializer(
             instance=cart_items, many=True, context={"request": request}
         )
@@ -60,6 +66,21 @@ class CartItemListCreateDelete(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class CartSummaryView(APIView):
+    permission_classes = [IsAuthenticated, CustomersOnly]
+
+    def get(self, request, **kwargs):
+        customer_pk = kwargs["pk"]
+        if request.user.pk != customer_pk:
+            raise PermissionDenied("Can't access cart Items of another user")
+
+        selector = CartItemSelector()
+        summary = selector.cart_summary(customer_pk)
+        data = CartSummaryOutSerializer(summary).data
+
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
 class CartItemDetail(APIView):
     permission_classes = [IsAuthenticated, CustomersOnly]
 
@@ -69,9 +90,9 @@ class CartItemDetail(APIView):
             raise PermissionDenied("Can't access cart Item of another user")
 
         cart_item_pk = kwargs["cart_item_pk"]
-        cart_item = get_object_or_404(
-            CartItem, pk=cart_item_pk, customer_id=customer_pk
-        )
+        cart_item = CartItemSelector().get_cart_item(customer_pk, cart_item_pk)
+        if cart_item is None:
+            raise NotFound
         serializer = CartItemOutSerializer(
             instance=cart_item, context={"request": request}
         )
@@ -85,12 +106,12 @@ class CartItemDetail(APIView):
             raise PermissionDenied("Can't access cart Item of another user")
 
         cart_item_pk = kwargs["cart_item_pk"]
-        cart_item = get_object_or_404(
-            CartItem, pk=cart_item_pk, customer_id=customer_pk
-        )
+        service = CartItemService()
+        cart_item = service.selector.get_cart_item(customer_pk, cart_item_pk)
+        if cart_item is None:
+            raise NotFound
         serializer = CartItemUpdateInputSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        service = CartItemService()
         service.update_quantity(cart_item, serializer.validated_data["quantity"])
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -101,11 +122,10 @@ class CartItemDetail(APIView):
             raise PermissionDenied("Can't access cart Item of another user")
 
         cart_item_pk = kwargs["cart_item_pk"]
-        cart_item = get_object_or_404(
-            CartItem, pk=cart_item_pk, customer_id=customer_pk
-        )
-
         service = CartItemService()
+        cart_item = service.selector.get_cart_item(customer_pk, cart_item_pk)
+        if cart_item is None:
+            raise NotFound
         service.cart_item_delete(cart_item)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,42 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+from django.urls import reverse
+
+
+PLACEHOLDER_BASE = 9876500000
+
+
+@lru_cache(maxsize=None)
+def get_url_template(viewname: str, kwarg_names: Tuple[str, ...]) -> str:
+    """
+    Resolve the url of `viewname` once with placeholder values and return it
+    as a `str.format` template e.g. "/api/products/{pk}"
+    """
+    placeholders = {
+        name: PLACEHOLDER_BASE + index for index, name in enumerate(kwarg_names)
+    }
+    url = reverse(viewname, kwargs=placeholders)
+    for name, value in placeholders.items():
+        url = url.replace(str(value), "{%s}" % name)
+    return url
+
+
+class LinkBuilder:
+    """Build absolute links by formatting the cached url templates
+    against the request base url instead of reverse() per link"""
+
+    def __init__(self, request) -> None:
+        self.base_url = request.build_absolute_uri("/")[:-1]
+
+    def build(self, viewname: str, **kwargs) -> str:
+        template = get_url_template(viewname, tuple(sorted(kwargs)))
+        return self.base_url + template.format(**kwargs)
+
+
+def get_link_builder(context: Dict) -> LinkBuilder:
+    """Return the link builder of the serialization context, nested
+    serializers share the root context so one builder serves the response"""
+    link_builder = context.get("link_builder")
+    if link_builder is None:
+        link_builder = context["link_builder"] = LinkBuilder(context["request"])
+    return link_builder
@@ -1,12 +1,126 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
-class PagePagination(PageNumberPagination):
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over the queryset ordering with `id` as a tie breaker.
+    The cursor holds the ordering values of the last returned row, so pages
+    are fetched with a WHERE condition instead of an OFFSET scan and no
+    COUNT(*) query is needed.
+    """
+
+    page_size = 12
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size: int = None) -> None:
+        if page_size:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*self.ordering)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position))
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+        self.next_position = self.get_position(results[-1]) if self.has_next else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict([("next", self.get_next_link()), ("results", data)])
+        )
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if "id" not in ordering and "-id" not in ordering:
+            ordering.append("id")
+        return ordering
+
+    def get_position(self, instance):
+        return [getattr(instance, field.lstrip("-")) for field in self.ordering]
+
+    def get_keyset_filter(self, position):
+        """Rows after `position`: (a > x) OR (a = x AND b > y) OR ..."""
+        keyset_filter, preceding_equal = Q(), Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            keyset_filter |= preceding_equal & Q(**{f"{name}__{lookup}": value})
+            preceding_equal &= Q(**{name: value})
+        return keyset_filter
+
+    def encode_cursor(self, position):
+        encoded = json.dumps(position, default=str).encode("utf-8")
+        return base64.urlsafe_b64encode(encoded).decode("ascii")
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+
+class OptionalKeysetPagination(PageNumberPagination):
+    """
+    Page number pagination that switches to KeysetPagination when the client
+    opts in with `?pagination=cursor` (or sends a cursor).
+    """
+
+    pagination_mode_query_param = "pagination"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        if self.is_cursor_mode(request):
+            self.keyset_paginator = KeysetPagination(page_size=self.page_size)
+            return self.keyset_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def is_cursor_mode(self, request):
+        return (
+            request.query_params.get(self.pagination_mode_query_param) == "cursor"
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+
+class PagePagination(OptionalKeysetPagination):
     page_size = 12
 
 
-class ProductPagination(PageNumberPagination):
+class ProductPagination(OptionalKeysetPagination):
     page_size = 12
 
-class OrderPagination(PageNumberPagination):
-    page_size = 12
\ No newline at end of file
+class OrderPagination(OptionalKeysetPagination):
+    page_size = 12
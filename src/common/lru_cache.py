@@ -0,0 +1,42 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class RefreshingLRUCache:
+    """
+    Thread safe in-process LRU cache. Entries older than `refresh_interval`
+    seconds are reloaded on access, the least recently used entries are
+    evicted once the cache holds more than `maxsize` entries.
+    """
+
+    def __init__(self, maxsize: int, refresh_interval: float) -> None:
+        self.maxsize = maxsize
+        self.refresh_interval = refresh_interval
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.refresh_interval:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # load outside the lock, concurrent misses may load the same key twice
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 
     "rest_framework",
     "knox",
@@ -163,9 +164,27 @@ EMAIL_HOST_PASSWORD = local_settings.EMAIL_HOST_PASSWORD
 
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Caching
+# No CACHES setting, Django's default local memory cache is used
+
+PRODUCT_DETAIL_CACHE_TIMEOUT = 60 * 60
+# count the product detail cache hits/misses, costs a cache write per lookup
+PRODUCT_DETAIL_CACHE_STATS = False
+PRODUCT_FACETS_CACHE_TIMEOUT = 60
+SUGGESTIONS_CACHE_SIZE = 2048
+SUGGESTIONS_CACHE_REFRESH_INTERVAL = 5 * 60
+CART_BACKEND = "carts.backends.DatabaseCartBackend"
+# seconds an idle cart stays in the cache of the CacheCartBackend
+CART_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
 # Media
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+# tests upload to a temporary MEDIA_ROOT
+TEST_RUNNER = "common.test_runner.TempMediaDiscoverRunner"
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024
+STORAGE_SERVICE = "utils.storage.SupabaseStorageService"
+# signed urls are cached until this many seconds before they expire
+SIGNED_URL_EXPIRY_MARGIN = 60 * 60
 SUPABASE_URL = local_settings.SUPABASE_URL
 SUPABASE_KEY = local_settings.SERVICE_KEY
 
@@ -201,3 +220,19 @@ STRIPE_PUBLISHER = os.environ.get(
 STRIPE_ENDPOINT_SECRET = os.environ.get(
     "STRIPE_ENDPOINT_SECRET", default=local_settings.STRIPE_ENDPOINT_SECRET
 )
+STRIPE_CONNECT_TIMEOUT = 5
+STRIPE_READ_TIMEOUT = 20
+STRIPE_MAX_NETWORK_RETRIES = 2
+
+PAYMENT_GATEWAY = "orders.payments.StripeGateway"
+# seconds the stock of an unpaid order stays reserved
+STOCK_RESERVATION_TTL = 15 * 60
+# rows fetched per round trip by the streaming order exports
+ORDER_EXPORT_CHUNK_SIZE = 2000
+
+# Webhook inbox retries, in seconds, doubled after every failed attempt
+WEBHOOK_MAX_ATTEMPTS = 8
+WEBHOOK_RETRY_BACKOFF = 30
+WEBHOOK_RETRY_MAX_BACKOFF = 60 * 60
+# seconds a worker holds the events it claimed before they are due again
+WEBHOOK_CLAIM_TIMEOUT = 5 * 60
@@ -0,0 +1,48 @@
+import csv
+import json
+from typing import Iterable, Iterator, Tuple
+
+
+EXPORT_COLUMNS = [
+    "order_id",
+    "customer_id",
+    "pickup_address_id",
+    "status",
+    "ordered_at",
+    "order_total_price",
+    "product_id",
+    "product_name",
+    "quantity",
+    "unit_price",
+]
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """File like object returning what is written, lets csv.writer
+    produce lines for a streaming response"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows: Iterable[Tuple]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(rows: Iterable[Tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n"
+
+
+def stream_export(rows: Iterable[Tuple], file_type: str) -> Iterator[str]:
+    if file_type == "ndjson":
+        return stream_ndjson(rows)
+    return stream_csv(rows)
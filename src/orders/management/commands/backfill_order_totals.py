@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from orders.models import Order
+from orders.services import OrderService
+
+
+class Command(BaseCommand):
+    help = "Recompute the persisted total price and items count of orders"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        service = OrderService()
+        updated, last_pk = 0, 0
+        while True:
+            batch = list(
+                Order.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            updated += service.refresh_totals(Order.objects.filter(pk__in=batch))
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} orders"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from orders.services import StockReservationService
+
+
+class Command(BaseCommand):
+    help = "Release the stock of expired reservations of unpaid orders"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        service = StockReservationService()
+        expired = 0
+        while True:
+            batch_count = service.expire_batch(options["batch_size"])
+            expired += batch_count
+            if batch_count < options["batch_size"]:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"Expired {expired} reservations"))
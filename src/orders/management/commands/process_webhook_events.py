@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand
+from orders.services import WebhookEventService
+
+
+class Command(BaseCommand):
+    help = "Process the pending events of the webhook inbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling for new events instead of exiting once drained",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1,
+            help="Seconds to wait between polls when the inbox is drained",
+        )
+
+    def handle(self, *args, **options):
+        service = WebhookEventService()
+        processed = 0
+        while True:
+            batch_count = service.process_batch(options["batch_size"])
+            processed += batch_count
+            if batch_count:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} events"))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from orders.models import DistributorSalesDaily
+from orders.services import SalesRollupService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the distributor daily sales rollups from the allocated orders"
+
+    def handle(self, *args, **options):
+        SalesRollupService().rebuild()
+        rollups = DistributorSalesDaily.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rollups} sales rollups"))
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.15 on 2026-10-18 09:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('addresses', '0007_alter_city_governorate_alter_store_city_and_more'),
+        ('products', '0016_product_reserved_quantity'),
+        ('accounts', '0005_distributor_customer'),
+        ('orders', '0009_stockreservation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistributorSalesDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('units', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('distributor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='accounts.distributor')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='products.product')),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='addresses.store')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['distributor', 'day'], name='distributor_sales_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='distributorsalesdaily',
+            constraint=models.UniqueConstraint(fields=('distributor', 'store', 'product', 'day'), name='unique_distributor_sales_day'),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.core.validators import MinValueValidator
+from django.utils import timezone
 from products.models import Product
-from accounts.models import Customer
+from accounts.models import Customer, Distributor
 from addresses.models import PickupAddress, Store
 
 
@@ -10,6 +11,8 @@ ORDER_STATUS_CHOICES = [
     ("placed", "Placed"),
     ("shipped", "Shipped"),
     ("delivered", "Delivered"),
+    # paid after its reservation expired and its stock was sold, refunded
+    ("cancelled", "Cancelled"),
 ]
 
 
@@ -19,6 +22,11 @@ class Order(models.Model):
     pickup_address = models.ForeignKey(PickupAddress, on_delete=models.PROTECT)
     status = models.CharField(choices=ORDER_STATUS_CHOICES, default="pending", max_length=12)
     ordered_at = models.DateTimeField(auto_now_add=True)
+    # persisted when the order is created, see OrderService.refresh_totals
+    total_price = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0, editable=False
+    )
+    items_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self) -> str:
         return f"Order #{self.pk}"
@@ -47,3 +55,80 @@ class OrderItemStore(models.Model):
     order_item = models.ForeignKey(OrderItem, on_delete=models.CASCADE)
     store = models.ForeignKey(Store, on_delete=models.CASCADE)
     reserved_quantity = models.SmallIntegerField(validators=[MinValueValidator(1)])
+
+
+WEBHOOK_EVENT_STATUS_CHOICES = [
+    ("pending", "Pending"),
+    ("processed", "Processed"),
+    ("failed", "Failed"),
+]
+
+
+class WebhookEvent(models.Model):
+    """Inbox of received payment events, processed asynchronously by the
+        process_webhook_events command"""
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField()
+    status = models.CharField(
+        choices=WEBHOOK_EVENT_STATUS_CHOICES, default="pending", max_length=12
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"{self.event_type} {self.event_id}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="pending_webhook_event_idx",
+            )
+        ]
+
+
+class StockReservation(models.Model):
+    """Stock held for an unpaid order until it's paid or `expires_at`,
+        counted in the product reserved_quantity"""
+    order = models.ForeignKey(Order, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.PROTECT)
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"Order #{self.order_id} reservation"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["expires_at"], name="reservation_expires_at_idx")
+        ]
+
+
+class DistributorSalesDaily(models.Model):
+    """Daily sales rollup of the allocated order items, maintained by
+        SalesRollupService"""
+    distributor = models.ForeignKey(Distributor, on_delete=models.CASCADE)
+    store = models.ForeignKey(Store, on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    day = models.DateField()
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self) -> str:
+        return f"Store #{self.store_id} sales of {self.day}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["distributor", "store", "product", "day"],
+                name="unique_distributor_sales_day",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["distributor", "day"], name="distributor_sales_day_idx")
+        ]
@@ -1,13 +1,12 @@
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 from addresses.serializers import PickupAddressOutSerializer, StoreOutSerializer
-from orders.services import ORDER_STATUS_CHOICES_LIST, OrderSelector
-from products.serializers import ProductListOutSerializer
+from orders.exports import EXPORT_CONTENT_TYPES
+from orders.services import MAX_BULK_STATUS_ORDERS, ORDER_STATUS_CHOICES_LIST
+from products.serializers import ProductCardField, ProductCardListSerializer
 from . import models
 
 
-order_selector = OrderSelector()
-
 class OrderItemSerializer(serializers.ModelSerializer):
     product_id = serializers.IntegerField()
     class Meta:
@@ -20,6 +19,10 @@ class OrderInputSerializer(serializers.Serializer):
     pickup_address_id = serializers.IntegerField()
 
 
+class CheckoutInputSerializer(serializers.Serializer):
+    pickup_address_id = serializers.IntegerField()
+
+
 class OrderListQueryParametersSerializer(serializers.Serializer):
     ordering = serializers.CharField(required=False)
     status = serializers.CharField(required=False)
@@ -44,12 +47,50 @@ class OrderListQueryParametersSerializer(serializers.Serializer):
         return val
 
 
+class OrderExportQueryParametersSerializer(serializers.Serializer):
+    file_type = serializers.ChoiceField(
+        choices=list(EXPORT_CONTENT_TYPES), default="csv"
+    )
+    status = serializers.CharField(required=False)
+    ordered_at__gte = serializers.DateTimeField(required=False)
+    ordered_at__lte = serializers.DateTimeField(required=False)
+
+    def validate_status(self, val: str):
+        val = val.lower()
+        if val not in ORDER_STATUS_CHOICES_LIST:
+            raise ValidationError("Invalid status")
+        return val
+
+    def get_filters(self):
+        """Order item filters of the validated parameters"""
+        return {
+            f"order__{name}": value
+            for name, value in self.validated_data.items()
+            if name != "file_type"
+        }
+
+class DistributorSalesQueryParametersSerializer(serializers.Serializer):
+    day__gte = serializers.DateField(required=False)
+    day__lte = serializers.DateField(required=False)
+    store_id = serializers.IntegerField(required=False)
+    product_id = serializers.IntegerField(required=False)
+
+
+class DistributorSalesOutSerializer(serializers.Serializer):
+    day = serializers.DateField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=14, decimal_places=2)
+
 
 class OrderItemOutSerializer(serializers.ModelSerializer):
-    product = ProductListOutSerializer()
+    product = ProductCardField()
     class Meta:
         model = models.OrderItem
         fields = ['quantity', 'unit_price', 'product']
+        list_serializer_class = ProductCardListSerializer
+
+    def get_product_ids(self, instance):
+        return [instance.product_id]
 
 
 class BaseOrderOutSerializer(serializers.ModelSerializer):
@@ -64,10 +105,11 @@ class BaseOrderOutSerializer(serializers.ModelSerializer):
             "status",
             "ordered_at",
             "total_price",
+            "items_count",
         ]
 
     def get_total_price(self, obj):
-        return order_selector.get_order_total_price(obj.pk)
+        return obj.total_price
     
     def get_status(self, obj):
         return obj.get_status_display()
@@ -77,6 +119,10 @@ class OrderOutSerializer(BaseOrderOutSerializer):
     order_items = OrderItemOutSerializer(many=True, source="orderitem_set")
     class Meta(BaseOrderOutSerializer.Meta):
         fields = BaseOrderOutSerializer.Meta.fields + ['order_items']
+        list_serializer_class = ProductCardListSerializer
+
+    def get_product_ids(self, instance):
+        return [item.product_id for item in instance.orderitem_set.all()]
 
 
 
@@ -104,11 +150,15 @@ class OrderItemStoresOutSerializer(serializers.ModelSerializer):
 
 
 class DeliveryOrderItemOutSerializer(serializers.ModelSerializer):
-    product = ProductListOutSerializer()
+    product = ProductCardField()
     stores = OrderItemStoresOutSerializer(many=True, source="orderitemstore_set")
     class Meta:
         model = models.OrderItem
         fields = ['quantity', 'unit_price', 'product', 'stores']
+        list_serializer_class = ProductCardListSerializer
+
+    def get_product_ids(self, instance):
+        return [instance.product_id]
 
 class DeliveryOrderOutSerializer(BaseOrderOutSerializer):
     order_items = DeliveryOrderItemOutSerializer(many=True, source="orderitem_set")
@@ -120,3 +170,17 @@ class DeliveryOrderOutSerializer(BaseOrderOutSerializer):
 
 class OrderStatusInputSerializer(serializers.Serializer):
     status = serializers.CharField()
+
+
+class WebhookEventInputSerializer(serializers.Serializer):
+    id = serializers.CharField(max_length=255)
+    type = serializers.CharField(max_length=100)
+
+
+class OrderBulkStatusInputSerializer(serializers.Serializer):
+    order_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_BULK_STATUS_ORDERS,
+    )
+    status = serializers.CharField()
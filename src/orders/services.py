@@ -1,60 +1,150 @@
-from typing import List, Dict
-import stripe
-from collections import deque
-from django.core.exceptions import ValidationError
+from typing import Dict, Iterable, List
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from decimal import Decimal
 from django.conf import settings
-from django.db import transaction
-from django.db.models import Sum, F
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    DecimalField,
+    F,
+    OuterRef,
+    Prefetch,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from rest_framework import exceptions as rest_exception
 from common.api.exceptions import Conflict, ServerError
+from carts.backends import get_cart_backend
 from products.services import ProductSelector
-from products.models import Inventory
-from addresses.models import PickupAddress
-from .models import Order, OrderItem, OrderItemStore
+from products.cache import product_detail_cache
+from products.models import Inventory, Product
+from addresses.models import PickupAddress, Store
+from .models import (
+    DistributorSalesDaily,
+    Order,
+    OrderItem,
+    OrderItemStore,
+    StockReservation,
+    WebhookEvent,
+)
+from .payments import get_payment_gateway
 
 
 MAX_ORDER_PRODUCTS = 10
+MAX_BULK_STATUS_ORDERS = 500
 
 
 ORDER_STATUS_CHOICES_LIST = ["pending", "placed", "shipped", "delivered"]
+# target status -> required current status of the bulk transitions, orders
+# are placed by their payment only, which allocates their stock
+BULK_STATUS_TRANSITIONS = {"shipped": "placed", "delivered": "shipped"}
+
+
+def not_enough_inventory_error(product_id: int, available_inventory: int):
+    return rest_exception.ValidationError({
+        product_id: {
+            "message": f"Not Enough inventory exist for product #{product_id}",
+            "available_inventory": available_inventory,
+        }
+    })
 
 
 class OrderService:
     def __init__(self) -> None:
         self.product_selector = ProductSelector()
         self.order_selector = OrderSelector()
+        self.reservation_service = StockReservationService()
+        self.sales_rollup_service = SalesRollupService()
+        self.cart_backend = get_cart_backend()
 
     def create(self, **order_data: Dict):
-        self._validate_order_items(order_data["order_items"])
-        self._validate_pickup_address(
-            order_data["customer_id"], order_data["pickup_address_id"]
+        return self._place_order(
+            order_data["customer_id"],
+            order_data["pickup_address_id"],
+            order_data["order_items"],
         )
 
+    def checkout(self, customer_id: int, pickup_address_id: int):
+        """Place an order of the customer cart items, the cart is cleared
+        once the payment intent of the order is created"""
+        cart_items = self.cart_backend.get_items(customer_id, select_products=True)
+        if not cart_items:
+            raise ValidationError("Cart is empty")
+        order_items = [
+            {"product_id": cart_item.product_id, "quantity": cart_item.quantity}
+            for cart_item in cart_items
+        ]
+        intent = self._place_order(customer_id, pickup_address_id, order_items)
+        self.cart_backend.clear(customer_id)
+        self.cart_backend.flush(customer_id)
+        return intent
+
+    def _place_order(
+        self,
+        customer_id: int,
+        pickup_address_id: int,
+        order_items: List[Dict],
+    ):
+        product_ids = [item["product_id"] for item in order_items]
+        products = self.product_selector.get_order_snapshot(product_ids)
+        self._validate_order_items(order_items, products)
+        self._validate_pickup_address(customer_id, pickup_address_id)
+
+        order_items_list = []
+        for order_item in order_items:
+            product_id, quantity = order_item["product_id"], order_item["quantity"]
+            order_items_list.append(OrderItem(
+                product_id=product_id,
+                unit_price=products[product_id]["price"],
+                quantity=quantity,
+            ))
+        total_price = sum(item.unit_price * item.quantity for item in order_items_list)
+        items_count = sum(item.quantity for item in order_items_list)
+
         with transaction.atomic():
             order = Order.objects.create(
-                customer_id=order_data["customer_id"],
-                pickup_address_id=order_data["pickup_address_id"],
+                customer_id=customer_id,
+                pickup_address_id=pickup_address_id,
+                total_price=total_price,
+                items_count=items_count,
             )
-            order_items_list = []
-            for order_item in order_data["order_items"]:
-                product_id, quantity = order_item["product_id"], order_item["quantity"]
-                product = self.product_selector.get_product(pk=product_id)
-                order_items_list.append(OrderItem(
-                    order=order,
-                    product_id=product_id,
-                    unit_price=product.price,
-                    quantity=quantity,
-                ))
-
+            for order_item in order_items_list:
+                order_item.order = order
             OrderItem.objects.bulk_create(order_items_list)
+            self.reservation_service.reserve(order, order_items_list)
 
-            total_price = self.order_selector.get_order_total_price(order.pk)
-            intent = self._create_payment_intent(order.pk, total_price)
+        # created after commit so no connection or lock is held during the call
+        try:
+            return self._create_payment_intent(order.pk, total_price)
+        except ServerError:
+            # the client never got the order, don't leave it holding the stock
+            self._discard_unpaid_order(order.pk)
+            raise
 
-        return intent
+    def refresh_totals(self, orders):
+        """Recompute the persisted totals of `orders` from their items"""
+        order_items = OrderItem.objects.filter(order_id=OuterRef("pk")).order_by()
+        total_price = order_items.values("order_id").annotate(
+            total=Sum(F("quantity") * F("unit_price"))
+        ).values("total")
+        items_count = order_items.values("order_id").annotate(
+            count=Sum("quantity")
+        ).values("count")
+        return orders.update(
+            total_price=Coalesce(Subquery(total_price), Value(0), output_field=DecimalField()),
+            items_count=Coalesce(Subquery(items_count), Value(0)),
+        )
 
     def update_status(self, order: Order, status: str):
         curr_status, status = order.status, status.lower()
+        if curr_status not in ORDER_STATUS_CHOICES_LIST:
+            raise Conflict(f"A {curr_status} order can't be updated")
         if status in ORDER_STATUS_CHOICES_LIST:
             curr_index = ORDER_STATUS_CHOICES_LIST.index(curr_status)
             status_index = ORDER_STATUS_CHOICES_LIST.index(status)
@@ -64,59 +154,168 @@ class OrderService:
         order.full_clean()
         order.save()
 
-    def handle_payment_intent_succeeded(self, order_id: int):
+    def bulk_update_status(self, order_ids: List[int], status: str) -> Dict:
+        """Advance the orders to `status` in one conditional UPDATE, only the
+        orders currently at the previous stage are updated"""
+        status = status.lower()
+        if status not in BULK_STATUS_TRANSITIONS:
+            raise ValidationError("Invalid status")
+        previous_status = BULK_STATUS_TRANSITIONS[status]
+
+        order_ids = list(dict.fromkeys(order_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE orders_order SET status = %s
+                WHERE id = ANY(%s) AND status = %s
+                RETURNING id
+                """,
+                [status, order_ids, previous_status],
+            )
+            updated = {row[0] for row in cursor.fetchall()}
+
+        existing = set(
+            Order.objects.filter(pk__in=set(order_ids) - updated).values_list(
+                "id", flat=True
+            )
+        )
+        return {
+            "updated": [pk for pk in order_ids if pk in updated],
+            "conflicts": [pk for pk in order_ids if pk in existing],
+            "not_found": [
+                pk for pk in order_ids if pk not in updated and pk not in existing
+            ],
+        }
+
+    def handle_payment_intent_succeeded(self, order_id: int, payment_intent_id: str = None):
         with transaction.atomic():
-            order_items = OrderItem.objects.filter(order_id=order_id)
-            for order_item in order_items:
-                self._assign_stores(order_item)
-            Order.objects.filter(id=order_id).update(status="placed")
-
-    def _assign_stores(self, order_item: OrderItem):
-        inventories = deque(
-            self.order_selector.get_available_inventories(order_item.product_id)
+            # the order row lock serializes duplicate deliveries of the event,
+            # only the first one finds the order pending
+            order = (
+                Order.objects.select_for_update()
+                .filter(id=order_id)
+                .values("status", "ordered_at")
+                .first()
+            )
+            if order is None or order["status"] not in ("pending", "cancelled"):
+                return
+            if order["status"] == "pending":
+                reservations = StockReservation.objects.select_for_update().filter(
+                    order_id=order_id
+                )
+                self.reservation_service.release(list(reservations))
+                order_items = list(OrderItem.objects.filter(order_id=order_id))
+                # the reservation may have expired and its stock been taken
+                if self._is_stock_available(order_items):
+                    order_item_stores = self._assign_stores(order_items)
+                    self.sales_rollup_service.record(
+                        order_item_stores, timezone.localdate(order["ordered_at"])
+                    )
+                    Order.objects.filter(id=order_id).update(status="placed")
+                    return
+                Order.objects.filter(id=order_id).update(status="cancelled")
+
+        # the payment of a cancelled order is refunded, refunds are idempotent
+        # so a redelivered event retries a failed refund
+        if payment_intent_id:
+            get_payment_gateway().refund_payment_intent(order_id, payment_intent_id)
+
+    def _is_stock_available(self, order_items: List[OrderItem]) -> bool:
+        """Whether the stock not reserved by other orders covers the items,
+        the products are locked until the end of the transaction"""
+        quantities = defaultdict(int)
+        for order_item in order_items:
+            quantities[order_item.product_id] += order_item.quantity
+        products = (
+            Product.objects.select_for_update()
+            .filter(pk__in=quantities)
+            .order_by("pk")
+            .values_list("pk", "total_quantity", "reserved_quantity")
+        )
+        available = {pk: total - reserved for pk, total, reserved in products}
+        return all(
+            available.get(product_id, 0) >= quantity
+            for product_id, quantity in quantities.items()
+        )
+
+    def _assign_stores(self, order_items: List[OrderItem]):
+        """Allocate the order items to the stores with the most inventory.
+        The inventories of all the products are locked at once so concurrent
+        allocations of the same products wait instead of overselling"""
+        product_ids = {order_item.product_id for order_item in order_items}
+        inventories = self.order_selector.get_available_inventories(
+            product_ids, lock=True
         )
-        requested_quantity = order_item.quantity
+        product_inventories = defaultdict(list)
+        for inventory in sorted(inventories, key=lambda inv: -inv.quantity):
+            product_inventories[inventory.product_id].append(inventory)
+
         order_item_stores = []
         inventories_update_list = []
-        while requested_quantity > 0 and inventories:
-            curr_inventory = inventories.popleft()
-            reserved_quantity = min(requested_quantity, curr_inventory.quantity)
-            order_item_store = OrderItemStore(
-                order_item=order_item,
-                reserved_quantity=reserved_quantity,
-                store_id=curr_inventory.store_id,
-            )
-            requested_quantity -= reserved_quantity
-            curr_inventory.quantity -= reserved_quantity
-            inventories_update_list.append(curr_inventory)
-            order_item_stores.append(order_item_store)
+        allocated_quantities = defaultdict(int)
+        for order_item in order_items:
+            inventories = deque(product_inventories[order_item.product_id])
+            requested_quantity = order_item.quantity
+            while requested_quantity > 0 and inventories:
+                curr_inventory = inventories.popleft()
+                reserved_quantity = min(requested_quantity, curr_inventory.quantity)
+                if reserved_quantity == 0:
+                    continue
+                order_item_stores.append(OrderItemStore(
+                    order_item=order_item,
+                    reserved_quantity=reserved_quantity,
+                    store_id=curr_inventory.store_id,
+                ))
+                requested_quantity -= reserved_quantity
+                curr_inventory.quantity -= reserved_quantity
+                inventories_update_list.append(curr_inventory)
+            if requested_quantity > 0:
+                # the inventories don't add up to the product total quantity
+                raise not_enough_inventory_error(
+                    order_item.product_id, order_item.quantity - requested_quantity
+                )
+            allocated_quantities[order_item.product_id] += order_item.quantity
 
         OrderItemStore.objects.bulk_create(order_item_stores)
-        Inventory.objects.bulk_update(inventories_update_list, ["quantity"])
+        Inventory.objects.bulk_update(set(inventories_update_list), ["quantity"])
+        allocated_quantities = {
+            product_id: quantity
+            for product_id, quantity in allocated_quantities.items()
+            if quantity
+        }
+        if allocated_quantities:
+            Product.objects.filter(pk__in=allocated_quantities).update(
+                total_quantity=F("total_quantity") - Case(
+                    *[
+                        When(pk=product_id, then=Value(quantity))
+                        for product_id, quantity in allocated_quantities.items()
+                    ],
+                    default=Value(0),
+                )
+            )
+        for product_id in product_ids:
+            product_detail_cache.invalidate(product_id)
+        return order_item_stores
 
-    def _validate_order_items(self, order_items: List):
+    def _validate_order_items(self, order_items: List, products: Dict[int, Dict]):
+        """`products` is the order snapshot of the requested products"""
         if len(order_items) > MAX_ORDER_PRODUCTS:
             raise ValidationError("Max order items allowed exceeded")
 
-        product_ids = [item["product_id"] for item in order_items]
-        inactive_products = self.product_selector.product_list(id__in=product_ids, is_active=False)
-        if inactive_products.exists():
+        if any(not product["is_active"] for product in products.values()):
             raise ValidationError("Requested product has been removed removed")
         
         for order_item in order_items:
             product_id, quantity = order_item["product_id"], order_item["quantity"]
-            self._validate_requested_quantity(product_id, quantity)
+            product = products.get(product_id)
+            total_inventory = product["available_quantity"] if product else 0
+            self._validate_requested_quantity(product_id, quantity, total_inventory)
 
-    def _validate_requested_quantity(self, product_id: int, quantity: int):
-        total_inventory = self.product_selector.get_total_quantity(product_id)
+    def _validate_requested_quantity(
+        self, product_id: int, quantity: int, total_inventory: int
+    ):
         if total_inventory < quantity:
-
-            raise rest_exception.ValidationError({
-                    product_id: {
-                        "message": f"Not Enough inventory exist for product #{product_id}",
-                        "available_inventory": total_inventory,
-                    }
-                })
+            raise not_enough_inventory_error(product_id, total_inventory)
 
     def _validate_pickup_address(self, customer_pk: int, pickup_address_pk: int):
         if not PickupAddress.objects.filter(
@@ -124,19 +323,24 @@ class OrderService:
         ).exists():
             raise ValidationError("Invalid Pickup Address")
 
-    def _create_payment_intent(self, order_id: int, total_price: float):
-        try:
-            stripe.api_key = settings.STRIPE_SECRET
-            intent = stripe.PaymentIntent.create(
-                amount=int(total_price * 100),
-                currency="usd",
-                automatic_payment_methods={
-                    "enabled": True,
-                },
-                metadata={
-                    "order_id": order_id,
-                },
+    def _discard_unpaid_order(self, order_id: int):
+        """Delete a pending order and release its reserved stock"""
+        with transaction.atomic():
+            is_pending = Order.objects.select_for_update().filter(
+                id=order_id, status="pending"
+            ).exists()
+            if not is_pending:
+                return
+            reservations = StockReservation.objects.select_for_update().filter(
+                order_id=order_id
             )
+            self.reservation_service.release(list(reservations))
+            OrderItem.objects.filter(order_id=order_id).delete()
+            Order.objects.filter(id=order_id).delete()
+
+    def _create_payment_intent(self, order_id: int, total_price: Decimal):
+        try:
+            intent = get_payment_gateway().create_payment_intent(order_id, total_price)
         except Exception as e:
             print(f"#### Error: {e}")
             raise ServerError()
@@ -144,6 +348,227 @@ class OrderService:
         return intent
 
 
+class StockReservationService:
+    """
+    Stock held for unpaid orders. A reservation counts against the product
+    availability until the order is paid or the reservation expires.
+    """
+
+    def __init__(self) -> None:
+        self.product_selector = ProductSelector()
+
+    def reserve(self, order: Order, order_items: List[OrderItem]):
+        quantities = defaultdict(int)
+        for order_item in order_items:
+            quantities[order_item.product_id] += order_item.quantity
+
+        # a fixed locking order keeps concurrent reservations from deadlocking
+        for product_id in sorted(quantities):
+            quantity = quantities[product_id]
+            is_reserved = Product.objects.filter(
+                pk=product_id,
+                total_quantity__gte=F("reserved_quantity") + quantity,
+            ).update(reserved_quantity=F("reserved_quantity") + quantity)
+            if not is_reserved:
+                # taken by a concurrent order since the order validation
+                raise not_enough_inventory_error(
+                    product_id, self.product_selector.get_total_quantity(product_id)
+                )
+
+        expires_at = timezone.now() + timedelta(seconds=settings.STOCK_RESERVATION_TTL)
+        StockReservation.objects.bulk_create([
+            StockReservation(
+                order=order,
+                product_id=product_id,
+                quantity=quantity,
+                expires_at=expires_at,
+            )
+            for product_id, quantity in quantities.items()
+        ])
+
+    def release(self, reservations: List[StockReservation]):
+        """Give back the reserved stock, `reservations` should be locked"""
+        if not reservations:
+            return
+        quantities = defaultdict(int)
+        for reservation in reservations:
+            quantities[reservation.product_id] += reservation.quantity
+
+        Product.objects.filter(pk__in=quantities).update(
+            reserved_quantity=F("reserved_quantity") - Case(
+                *[
+                    When(pk=product_id, then=Value(quantity))
+                    for product_id, quantity in quantities.items()
+                ],
+                default=Value(0),
+            )
+        )
+        StockReservation.objects.filter(
+            pk__in=[reservation.pk for reservation in reservations]
+        ).delete()
+
+    def expire_batch(self, batch_size: int = 500) -> int:
+        """Release a batch of expired reservations, return the batch size"""
+        with transaction.atomic():
+            reservations = list(
+                StockReservation.objects.select_for_update(skip_locked=True)
+                .filter(expires_at__lte=timezone.now())
+                .order_by("expires_at")[:batch_size]
+            )
+            self.release(reservations)
+        return len(reservations)
+
+
+class SalesRollupService:
+    """
+    Maintains DistributorSalesDaily, the units and revenue per distributor,
+    store, product and order day of the allocated order items.
+    """
+
+    upsert_sql = """
+        INSERT INTO orders_distributorsalesdaily
+            (distributor_id, store_id, product_id, day, units, revenue)
+        VALUES {values}
+        ON CONFLICT (distributor_id, store_id, product_id, day) DO UPDATE SET
+            units = orders_distributorsalesdaily.units + EXCLUDED.units,
+            revenue = orders_distributorsalesdaily.revenue + EXCLUDED.revenue
+    """
+
+    rebuild_sql = """
+        INSERT INTO orders_distributorsalesdaily
+            (distributor_id, store_id, product_id, day, units, revenue)
+        SELECT
+            store.distributor_id,
+            item_store.store_id,
+            item.product_id,
+            (orders.ordered_at AT TIME ZONE %s)::date,
+            SUM(item_store.reserved_quantity),
+            SUM(item_store.reserved_quantity * item.unit_price)
+        FROM orders_orderitemstore AS item_store
+        JOIN orders_orderitem AS item ON item.id = item_store.order_item_id
+        JOIN orders_order AS orders ON orders.id = item.order_id
+        JOIN addresses_store AS store ON store.id = item_store.store_id
+        WHERE orders.status <> 'pending'
+        GROUP BY 1, 2, 3, 4
+    """
+
+    def record(self, order_item_stores: List[OrderItemStore], day: date):
+        """Add the allocations of an order placed on `day` to the rollups"""
+        if not order_item_stores:
+            return
+        distributors = dict(
+            Store.objects.filter(
+                pk__in={item_store.store_id for item_store in order_item_stores}
+            ).values_list("id", "distributor_id")
+        )
+        rollups = defaultdict(lambda: [0, 0])
+        for item_store in order_item_stores:
+            key = (
+                distributors[item_store.store_id],
+                item_store.store_id,
+                item_store.order_item.product_id,
+            )
+            rollups[key][0] += item_store.reserved_quantity
+            rollups[key][1] += item_store.reserved_quantity * item_store.order_item.unit_price
+
+        # sorted keys lock the rollup rows in a fixed order
+        params = []
+        for key in sorted(rollups):
+            params.extend([*key, day, *rollups[key]])
+        values = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(rollups))
+        with connection.cursor() as cursor:
+            cursor.execute(self.upsert_sql.format(values=values), params)
+
+    def rebuild(self):
+        with transaction.atomic():
+            DistributorSalesDaily.objects.all().delete()
+            with connection.cursor() as cursor:
+                cursor.execute(self.rebuild_sql, [settings.TIME_ZONE])
+
+
+class WebhookEventService:
+    def __init__(self) -> None:
+        self.order_service = OrderService()
+        self.handlers = {
+            "payment_intent.succeeded": self._handle_payment_intent_succeeded,
+        }
+
+    def receive(self, event: Dict) -> bool:
+        """Store the event in the inbox, return False if it was already received"""
+        _, created = WebhookEvent.objects.get_or_create(
+            event_id=event["id"],
+            defaults={"event_type": event["type"], "payload": event},
+        )
+        return created
+
+    def process_batch(self, batch_size: int = 100) -> int:
+        """Process the due pending events, return the number of events taken.
+        The events are claimed first so several workers can drain the inbox,
+        then processed in a transaction each so the locks taken by an event
+        handler are released as soon as the event is done"""
+        now = timezone.now()
+        with transaction.atomic():
+            event_ids = list(
+                WebhookEvent.objects.select_for_update(skip_locked=True)
+                .filter(status="pending", next_attempt_at__lte=now)
+                .order_by("next_attempt_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            # claimed events are due again after the lease if the worker dies
+            WebhookEvent.objects.filter(id__in=event_ids).update(
+                next_attempt_at=now + timedelta(seconds=settings.WEBHOOK_CLAIM_TIMEOUT)
+            )
+
+        for event_id in event_ids:
+            with transaction.atomic():
+                event = (
+                    WebhookEvent.objects.select_for_update()
+                    .filter(id=event_id, status="pending")
+                    .first()
+                )
+                if event is not None:
+                    self._process(event)
+        return len(event_ids)
+
+    def _process(self, event: WebhookEvent):
+        handler = self.handlers.get(event.event_type)
+        event.attempts += 1
+        try:
+            if handler is not None:
+                with transaction.atomic():
+                    handler(event.payload)
+        except Exception as e:
+            event.last_error = repr(e)
+            if event.attempts >= settings.WEBHOOK_MAX_ATTEMPTS:
+                event.status = "failed"
+            else:
+                backoff = min(
+                    settings.WEBHOOK_RETRY_BACKOFF * 2 ** (event.attempts - 1),
+                    settings.WEBHOOK_RETRY_MAX_BACKOFF,
+                )
+                event.next_attempt_at = timezone.now() + timedelta(seconds=backoff)
+        else:
+            event.status = "processed"
+            event.processed_at = timezone.now()
+
+        event.save(
+            update_fields=[
+                "status",
+                "attempts",
+                "next_attempt_at",
+                "last_error",
+                "processed_at",
+            ]
+        )
+
+    def _handle_payment_intent_succeeded(self, payload: Dict):
+        payment_intent = payload["data"]["object"]
+        order_id = int(payment_intent["metadata"]["order_id"])
+        self.order_service.handle_payment_intent_succeeded(
+            order_id, payment_intent.get("id")
+        )
+
+
 class OrderSelector:
     def order_list(self, ordering: List[str] = None, **filters):
         orders = Order.objects.filter(**filters)
@@ -151,14 +576,49 @@ class OrderSelector:
             orders = orders.order_by(*ordering)
         return orders
 
-    def get_order_total_price(self, order_pk: int):
-        total_price = OrderItem.objects.filter(order_id=order_pk).aggregate(
-            total=Sum(F("quantity") * F("unit_price"), default=0)
-        )["total"]
-        return total_price
+    def with_order_items(self, orders, *related_lookups: str):
+        """Prefetch the order items, their products are batched by the product
+        card loader. `related_lookups` are extra order item relations to prefetch"""
+        order_items = OrderItem.objects.prefetch_related(*related_lookups)
+        return orders.prefetch_related(Prefetch("orderitem_set", queryset=order_items))
+
+    def order_export_rows(self, **filters):
+        """One row per order item joined with its order and product, in the
+        order of EXPORT_COLUMNS, read through a server side cursor"""
+        order_items = (
+            OrderItem.objects.filter(**filters)
+            .order_by("order_id", "id")
+            .values_list(
+                "order_id",
+                "order__customer_id",
+                "order__pickup_address_id",
+                "order__status",
+                "order__ordered_at",
+                "order__total_price",
+                "product_id",
+                "product__name",
+                "quantity",
+                "unit_price",
+            )
+        )
+        return order_items.iterator(chunk_size=settings.ORDER_EXPORT_CHUNK_SIZE)
+
+    def daily_sales(self, distributor_pk: int, **filters):
+        """Units and revenue per day of the distributor, read from the rollups"""
+        sales = DistributorSalesDaily.objects.filter(
+            distributor_id=distributor_pk, **filters
+        )
+        return sales.values("day").annotate(
+            units=Sum("units"), revenue=Sum("revenue")
+        ).order_by("day")
 
-    def get_available_inventories(self, product_id: int):
-        inventories = Inventory.objects.filter(product_id=product_id).order_by(
-            "-quantity"
+    def get_available_inventories(self, product_ids: Iterable[int], lock: bool = False):
+        inventories = Inventory.objects.filter(
+            product_id__in=product_ids, quantity__gt=0
         )
+        if lock:
+            # a fixed locking order keeps concurrent allocations from deadlocking
+            inventories = inventories.select_for_update().order_by("product_id", "id")
+        else:
+            inventories = inventories.order_by("-quantity")
         return inventories
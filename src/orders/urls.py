@@ -7,6 +7,8 @@ app_name = "orders"
 urlpatterns = [
     path("", views.OrderListCreateView().as_view(), name="orders"),
     path("<int:pk>", views.OrderDetailUpdateView().as_view(), name="order"),
+    path("export", views.OrderExportView().as_view(), name="orders_export"),
+    path("status", views.OrderBulkStatusView().as_view(), name="orders_status"),
     path("publisher-key", views.get_publisher_key, name="publisher_key"),
     path("webhook", views.webhook, name="success_payment_handler"),
 ]
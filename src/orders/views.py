@@ -1,5 +1,7 @@
+import json
 import stripe
 from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view
@@ -9,6 +11,7 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from common.api.paginator import OrderPagination
 from common.api.permissions import CustomersOnly, DeliveriesOnly
+from orders.exports import EXPORT_CONTENT_TYPES, stream_export
 from orders.models import Order
 from . import serializers
 from . import services
@@ -55,6 +58,29 @@ class OrderListCreateView(APIView):
         return paginated_response
 
 
+class CheckoutView(APIView):
+    permission_classes = [IsAuthenticated, CustomersOnly]
+
+    def post(self, request, **kwargs):
+        customer_pk = kwargs["pk"]
+        if request.user.pk != customer_pk:
+            raise PermissionDenied("Customers can checkout just their own carts!")
+
+        serializer = serializers.CheckoutInputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        service = services.OrderService()
+        intent = service.checkout(
+            customer_pk, serializer.validated_data["pickup_address_id"]
+        )
+
+        return Response(
+            data={
+                "client_secret": intent["client_secret"],
+                'dpm_checker_link': 'https://dashboard.stripe.com/settings/payment_methods/review?transaction_id={}'.format(intent['id'])},
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class CustomerOrderListView(APIView):
     permission_classes = [IsAuthenticated, CustomersOnly]
 
@@ -71,7 +97,8 @@ class CustomerOrderListView(APIView):
         selector = services.OrderSelector()
         orders = selector.order_list(
             customer_id=customer_pk, **query_params.validated_data
-        ).prefetch_related("products")
+        )
+        orders = selector.with_order_items(orders)
 
         paginator = OrderPagination()
         paginated_data = paginator.paginate_queryset(orders, request)
@@ -84,13 +111,70 @@ class CustomerOrderListView(APIView):
         return paginated_response
 
 
+class OrderBulkStatusView(APIView):
+    permission_classes = [IsAuthenticated, DeliveriesOnly]
+
+    def patch(self, request, **kwargs):
+        serializer = serializers.OrderBulkStatusInputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        service = services.OrderService()
+        result = service.bulk_update_status(**serializer.validated_data)
+
+        return Response(data=result, status=status.HTTP_200_OK)
+
+
+class BaseOrderExportView(APIView):
+    """Stream the order items matching the query parameters as CSV or NDJSON"""
+
+    def get_filters(self, request, **kwargs):
+        return {}
+
+    def get(self, request, **kwargs):
+        query_params = serializers.OrderExportQueryParametersSerializer(
+            data=request.query_params
+        )
+        query_params.is_valid(raise_exception=True)
+        file_type = query_params.validated_data["file_type"]
+
+        selector = services.OrderSelector()
+        rows = selector.order_export_rows(
+            **query_params.get_filters(), **self.get_filters(request, **kwargs)
+        )
+
+        response = StreamingHttpResponse(
+            stream_export(rows, file_type),
+            content_type=EXPORT_CONTENT_TYPES[file_type],
+        )
+        response["Content-Disposition"] = f'attachment; filename="orders.{file_type}"'
+        return response
+
+
+class OrderExportView(BaseOrderExportView):
+    permission_classes = [IsAuthenticated, DeliveriesOnly]
+
+
+class CustomerOrderExportView(BaseOrderExportView):
+    permission_classes = [IsAuthenticated, CustomersOnly]
+
+    def get_filters(self, request, **kwargs):
+        customer_pk = kwargs["pk"]
+        if request.user.pk != customer_pk:
+            raise PermissionDenied("Access to this resource is denied")
+        return {"order__customer_id": customer_pk}
+
+
 class OrderDetailUpdateView(APIView):
 
     permission_classes = [IsAuthenticated, DeliveriesOnly]
 
     def get(self, request, **kwargs):
         order_pk = kwargs['pk']
-        order = get_object_or_404(Order.objects.prefetch_related('products'), id=order_pk)
+        selector = services.OrderSelector()
+        orders = selector.with_order_items(
+            Order.objects.select_related("pickup_address__city"),
+            "orderitemstore_set__store__city__governorate",
+        )
+        order = get_object_or_404(orders, id=order_pk)
         data = serializers.DeliveryOrderOutSerializer(order, context={"request": request}).data
         return Response(data=data)
     
@@ -111,27 +195,28 @@ class OrderDetailUpdateView(APIView):
 
 @api_view(["POST"])
 def webhook(request):
-    event = None
     payload = request.body
     endpoint_secret = settings.STRIPE_ENDPOINT_SECRET
-    if endpoint_secret:
-        sig_header = request.headers.get('stripe-signature', None)
-        stripe.api_key = settings.STRIPE_SECRET
-        try:
-            event = stripe.Webhook.construct_event(
-                payload, sig_header, endpoint_secret
-            )
-        except stripe.error.SignatureVerificationError as e:
-            print('Webhook signature verification failed.' + str(e))
-            return Response({'success':False})
-
-    if event and event['type'] == 'payment_intent.succeeded':
-        payment_intent = event['data']['object']
-        order_id = int(payment_intent['metadata']['order_id'])
-        service = services.OrderService()
-        service.handle_payment_intent_succeeded(order_id)
-    else:
-        print('Unhandled event type {}'.format(event['type']))
+    if not endpoint_secret:
+        # unverified events could mark orders as paid
+        print('Webhook rejected, STRIPE_ENDPOINT_SECRET is not configured.')
+        return Response({'success':False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    sig_header = request.headers.get('stripe-signature', None)
+    try:
+        stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
+    except (ValueError, stripe.error.SignatureVerificationError) as e:
+        print('Webhook signature verification failed.' + str(e))
+        return Response({'success':False}, status=status.HTTP_400_BAD_REQUEST)
+
+    # the verified raw payload is stored, stripe.Event isn't json serializable
+    event = json.loads(payload)
+    serializer = serializers.WebhookEventInputSerializer(data=event)
+    serializer.is_valid(raise_exception=True)
+
+    # processed by the process_webhook_events command
+    service = services.WebhookEventService()
+    service.receive(event)
 
     return Response({'success':True})
 
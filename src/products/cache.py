@@ -0,0 +1,99 @@
+import hashlib
+import time
+from typing import Callable, Dict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class ProductDetailCache:
+    """
+    Versioned cache of serialized product details.
+
+    Each product has a version number that is part of its payload cache keys,
+    invalidating a product bumps its version so the old payloads are never
+    read again and expire on their own. A hit costs two cache reads, the
+    version and the payload. The hit/miss counters are extra writes and are
+    only kept if the PRODUCT_DETAIL_CACHE_STATS setting is enabled.
+    """
+
+    key_prefix = "product_detail"
+    stats_key = "product_detail_cache_stats"
+
+    def __init__(self, timeout: int = None) -> None:
+        self.timeout = timeout
+
+    def get_or_set(self, product_pk: int, variant: str, build: Callable[[], Dict]):
+        """Return the cached payload of the product or build and cache it.
+        `variant` separates payloads that differ per request (e.g. the base URL
+        of the absolute links)"""
+        key = self._payload_key(product_pk, variant)
+        data = cache.get(key)
+        if data is not None:
+            self._increment_stat("hits")
+            return data
+
+        self._increment_stat("misses")
+        data = build()
+        cache.set(key, data, self._timeout())
+        return data
+
+    def invalidate(self, product_pk: int):
+        # bump again after commit so that a read during the transaction
+        # can't keep the pre-commit payload cached
+        self._bump_version(product_pk)
+        transaction.on_commit(lambda: self._bump_version(product_pk))
+        self._increment_stat("invalidations")
+
+    def stats(self) -> Dict:
+        stats = {
+            name: cache.get(f"{self.stats_key}:{name}", 0)
+            for name in ["hits", "misses", "invalidations"]
+        }
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0
+        return stats
+
+    def _payload_key(self, product_pk: int, variant: str) -> str:
+        variant_hash = hashlib.md5(variant.encode("utf-8")).hexdigest()
+        version = self._get_version(product_pk)
+        return f"{self.key_prefix}:{product_pk}:{version}:{variant_hash}"
+
+    def _timeout(self) -> int:
+        return self.timeout or settings.PRODUCT_DETAIL_CACHE_TIMEOUT
+
+    def _version_key(self, product_pk: int) -> str:
+        return f"{self.key_prefix}:{product_pk}:version"
+
+    def _get_version(self, product_pk: int) -> int:
+        key = self._version_key(product_pk)
+        version = cache.get(key)
+        if version is None:
+            # versions start from the current time so that an evicted or
+            # expired version never points back to payloads of an older one,
+            # they don't need to outlive the payloads
+            version = time.time_ns()
+            if not cache.add(key, version, self._timeout()):
+                version = cache.get(key, version)
+        return version
+
+    def _bump_version(self, product_pk: int):
+        key = self._version_key(product_pk)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), self._timeout())
+
+    def _increment_stat(self, name: str):
+        if not settings.PRODUCT_DETAIL_CACHE_STATS:
+            return
+        key = f"{self.stats_key}:{name}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            # the counters are best effort, an increment racing the first
+            # one of a counter can be lost
+            cache.add(key, 1, None)
+
+
+product_detail_cache = ProductDetailCache()
@@ -46,7 +46,7 @@ class CategoryProductListView(APIView):
         )
 
         paginator = ProductPagination()
-        products = products.prefetch_related("brand")
+        products = selector.with_list_related(products)
         paginated_dataset = paginator.paginate_queryset(products, request)
 
         serializer = serializers.ProductListOutSerializer(
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.15 on 2026-10-18 08:55
+
+from django.db import migrations, models
+
+
+BACKFILL_TOTAL_QUANTITY_SQL = """
+UPDATE products_product AS product
+SET total_quantity = COALESCE(
+    (SELECT SUM(quantity) FROM products_inventory WHERE product_id = product.id), 0
+);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0012_product_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='total_quantity',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(BACKFILL_TOTAL_QUANTITY_SQL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['total_quantity'], name='total_quantity_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.15 on 2026-10-18 09:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+BACKFILL_CATEGORY_SQL = """
+UPDATE products_product AS product
+SET category_id = sub_category.category_id
+FROM products_subcategory AS sub_category
+WHERE sub_category.id = product.sub_category_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_product_name_trgm_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, to='products.category'),
+        ),
+        migrations.RunSQL(BACKFILL_CATEGORY_SQL, migrations.RunSQL.noop),
+        migrations.AlterField(
+            model_name='product',
+            name='category',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, to='products.category'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'is_active', 'price'], name='category_active_price_idx'),
+        ),
+    ]
@@ -1,7 +1,8 @@
 from django.db import models
 from django.core.validators import MinValueValidator
-from django.contrib.postgres.indexes import GinIndex
-from django.contrib.postgres.search import SearchVector
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from addresses.models import Store
 from brands.models import Brand
 from accounts.models import Customer
@@ -20,6 +21,13 @@ class SubCategory(models.Model):
     name = models.CharField(unique=True)
     category = models.ForeignKey(Category, on_delete=models.PROTECT)
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # keep the category denormalized on products in sync
+        Product.objects.filter(sub_category_id=self.pk).exclude(
+            category_id=self.category_id
+        ).update(category_id=self.category_id)
+
     def __str__(self) -> str:
         return self.name
 
@@ -32,20 +40,69 @@ class Product(models.Model):
     )
     added_at = models.DateTimeField(auto_now_add=True)
     sub_category = models.ForeignKey(SubCategory, on_delete=models.PROTECT)
+    # denormalized from the sub category for direct category listing
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, editable=False)
     brand = models.ForeignKey(Brand, on_delete=models.PROTECT)
     stores = models.ManyToManyField(Store, through="Inventory")
     is_active = models.BooleanField(default=True)
+    # weighted (name A, description B) english vector, kept current by a
+    # database trigger on insert and on name/description updates
+    search_vector = SearchVectorField(null=True, editable=False)
+    # sum of the product inventories quantities, maintained by ProductService
+    # and OrderService on inventory writes
+    total_quantity = models.IntegerField(default=0, editable=False)
+    # quantity held by the stock reservations of unpaid orders
+    reserved_quantity = models.IntegerField(default=0, editable=False)
+    # review rating aggregates, maintained by ReviewService
+    ratings_count = models.IntegerField(default=0, editable=False)
+    ratings_sum = models.IntegerField(default=0, editable=False)
+    rating_1_count = models.IntegerField(default=0, editable=False)
+    rating_2_count = models.IntegerField(default=0, editable=False)
+    rating_3_count = models.IntegerField(default=0, editable=False)
+    rating_4_count = models.IntegerField(default=0, editable=False)
+    rating_5_count = models.IntegerField(default=0, editable=False)
+    # average rating, 0 for products without reviews
+    rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False
+    )
 
     class Meta:
         indexes = [
+            GinIndex(fields=["search_vector"], name="search_vector_idx"),
+            # name suggestions, names starting with a prefix are a range scan
+            # of the pattern index, names with a later word starting with it
+            # a prefix query of the words index
+            models.Index(
+                OpClass(Upper("name"), name="text_pattern_ops"),
+                name="product_name_prefix_idx",
+            ),
             GinIndex(
-                SearchVector("name", "description", config="english"),
-                name="search_vector_idx",
+                SearchVector("name", config="simple"), name="product_name_words_idx"
             ),
             models.Index(fields=['price'], name='price_idx'),
-            models.Index(fields=["is_active"], name="is_active_idx")
+            models.Index(fields=["is_active"], name="is_active_idx"),
+            models.Index(fields=["total_quantity"], name="total_quantity_idx"),
+            models.Index(fields=["rating"], name="rating_idx"),
+            models.Index(
+                fields=["category", "is_active", "price"],
+                name="category_active_price_idx",
+            ),
         ]
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "sub_category" in update_fields:
+            self.category_id = self.sub_category.category_id
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "category"}
+        super().save(*args, **kwargs)
+
+    @property
+    def rating_histogram(self):
+        return {
+            rating: getattr(self, f"rating_{rating}_count") for rating in range(1, 6)
+        }
+
     def __str__(self) -> str:
         return self.name
 
@@ -1,6 +1,8 @@
-from django.urls import reverse
+from typing import Dict, Iterable
+from django.db.models import Manager
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
+from common.api.links import get_link_builder
 from . import models
 from . import services
 
@@ -78,9 +80,10 @@ class ProductListQueryParametersSerializer(serializers.Serializer):
     ordering = serializers.CharField(required=False)
     price__range = serializers.CharField(required=False)
     sub_category_id = serializers.IntegerField(required=False)
+    in_stock = serializers.BooleanField(required=False, allow_null=True)
 
     def validate_ordering(self, val):
-        ordering_attributes = ["price", "-price"]
+        ordering_attributes = ["price", "-price", "rating", "-rating"]
         if not val:
             return []
         ordering_list = val.split(",")
@@ -105,34 +108,45 @@ class ProductListQueryParametersSerializer(serializers.Serializer):
         return p_range
 
 
+class SuggestionQueryParametersSerializer(serializers.Serializer):
+    prefix = serializers.CharField(max_length=50)
+    limit = serializers.IntegerField(min_value=1, max_value=20, default=10)
+
+
 class ProductListOutSerializer(serializers.ModelSerializer):
     brand = serializers.StringRelatedField()
     cover_image = serializers.SerializerMethodField()
 
     class Meta:
         model = models.Product
-        fields = ["id", "name", "price", "brand", "cover_image"]
+        fields = [
+            "id",
+            "name",
+            "price",
+            "rating",
+            "ratings_count",
+            "brand",
+            "cover_image",
+        ]
 
     def get_cover_image(self, obj):
+        if hasattr(obj, "cover_items"):
+            # prefetched by ProductSelector.with_list_related
+            return obj.cover_items[0].image.url if obj.cover_items else None
         image_url = product_selector.get_cover_image_url(obj.pk)
         return image_url
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        self_url = reverse("products:product", kwargs={"pk": instance.pk})
-        brand_url = reverse("brands:brand", kwargs={"pk": instance.brand_id})
-        category_url = reverse(
-            "categories:category", kwargs={"pk": instance.sub_category.category_id}
-        )
-        sub_category_url = reverse(
-            "sub_categories:sub_category", kwargs={"pk": instance.sub_category_id}
-        )
+        link_builder = get_link_builder(self.context)
         links = {
-            "self": self.context["request"].build_absolute_uri(self_url),
-            "brand": self.context["request"].build_absolute_uri(brand_url),
-            "category": self.context["request"].build_absolute_uri(category_url),
-            "sub_category": self.context["request"].build_absolute_uri(
-                sub_category_url
+            "self": link_builder.build("products:product", pk=instance.pk),
+            "brand": link_builder.build("brands:brand", pk=instance.brand_id),
+            "category": link_builder.build(
+                "categories:category", pk=instance.category_id
+            ),
+            "sub_category": link_builder.build(
+                "sub_categories:sub_category", pk=instance.sub_category_id
             ),
         }
 
@@ -140,6 +154,72 @@ class ProductListOutSerializer(serializers.ModelSerializer):
         return data
 
 
+class ProductCardLoader:
+    """
+    Batches the product cards (ProductListOutSerializer data) of a response.
+    Product ids are primed while iterating the top level items, the first
+    card lookup then loads every primed product at once in a fixed number
+    of queries, and each distinct product is serialized once.
+    """
+
+    def __init__(self, context: Dict) -> None:
+        self.context = context
+        self.cards = {}
+        self.pending = set()
+
+    def prime(self, product_ids: Iterable[int]):
+        self.pending.update(pk for pk in product_ids if pk not in self.cards)
+
+    def load(self, product_id: int) -> Dict:
+        if product_id not in self.cards:
+            self.pending.add(product_id)
+            self._load_pending()
+        return self.cards[product_id]
+
+    def _load_pending(self):
+        products = product_selector.with_list_related(
+            models.Product.objects.filter(pk__in=self.pending)
+        )
+        for product in products:
+            self.cards[product.pk] = ProductListOutSerializer(
+                product, context=self.context
+            ).data
+        self.pending.clear()
+
+
+def get_product_card_loader(context: Dict) -> ProductCardLoader:
+    """Return the product card loader of the serialization context, nested
+    serializers share the root context so one loader serves the response"""
+    loader = context.get("product_card_loader")
+    if loader is None:
+        loader = context["product_card_loader"] = ProductCardLoader(context)
+    return loader
+
+
+class ProductCardField(serializers.Field):
+    """Read only product card of the instance `product_id`"""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("source", "product_id")
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        return get_product_card_loader(self.context).load(value)
+
+
+class ProductCardListSerializer(serializers.ListSerializer):
+    """Primes the product card loader with the products of all the items,
+    the child serializer lists them with `get_product_ids(instance)`"""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, Manager) else data)
+        get_product_card_loader(self.context).prime(
+            pk for item in items for pk in self.child.get_product_ids(item)
+        )
+        return super().to_representation(items)
+
+
 class AlbumItemOutSerializer(serializers.ModelSerializer):
     url = serializers.SerializerMethodField()
 
@@ -158,6 +238,7 @@ class ProductOutSerializer(serializers.ModelSerializer):
     album_items = AlbumItemOutSerializer(many=True, read_only=True)
     inventory = serializers.SerializerMethodField()
     category = serializers.SerializerMethodField()
+    rating_histogram = serializers.ReadOnlyField()
 
     class Meta:
         model = models.Product
@@ -166,6 +247,9 @@ class ProductOutSerializer(serializers.ModelSerializer):
             "name",
             "description",
             "price",
+            "rating",
+            "ratings_count",
+            "rating_histogram",
             "added_at",
             "sub_category",
             "category",
@@ -175,32 +259,25 @@ class ProductOutSerializer(serializers.ModelSerializer):
         ]
 
     def get_inventory(self, obj):
-        total_quantity = product_selector.get_total_quantity(obj.pk)
         inventory = product_selector.get_inventory(obj.pk)
         inventory = [inv for inv in inventory]
-        inventory = {"total_quantity": total_quantity, "stores": inventory}
+        inventory = {"total_quantity": obj.total_quantity, "stores": inventory}
         return inventory
 
     def get_category(self, obj):
-        category = models.Category.objects.get(pk=obj.sub_category.category_id)
-        return category.name
+        return obj.category.name
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        self_url = reverse("products:product", kwargs={"pk": instance.pk})
-        brand_url = reverse("brands:brand", kwargs={"pk": instance.brand_id})
-        category_url = reverse(
-            "categories:category", kwargs={"pk": instance.sub_category.category_id}
-        )
-        sub_category_url = reverse(
-            "sub_categories:sub_category", kwargs={"pk": instance.sub_category_id}
-        )
+        link_builder = get_link_builder(self.context)
         links = {
-            "self": self.context["request"].build_absolute_uri(self_url),
-            "brand": self.context["request"].build_absolute_uri(brand_url),
-            "category": self.context["request"].build_absolute_uri(category_url),
-            "sub_category": self.context["request"].build_absolute_uri(
-                sub_category_url
+            "self": link_builder.build("products:product", pk=instance.pk),
+            "brand": link_builder.build("brands:brand", pk=instance.brand_id),
+            "category": link_builder.build(
+                "categories:category", pk=instance.category_id
+            ),
+            "sub_category": link_builder.build(
+                "sub_categories:sub_category", pk=instance.sub_category_id
             ),
         }
 
@@ -213,11 +290,15 @@ class FavoriteItemInputSerializer(serializers.Serializer):
 
 
 class FavoriteItemOutSerializer(serializers.ModelSerializer):
-    product = ProductListOutSerializer()
+    product = ProductCardField()
 
     class Meta:
         model = models.FavoriteItem
         fields = ["id", "product", "customer_id"]
+        list_serializer_class = ProductCardListSerializer
+
+    def get_product_ids(self, instance):
+        return [instance.product_id]
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -1,25 +1,56 @@
+import hashlib
+import json
 from typing import List, Dict
 from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import transaction
-from django.db.models import Subquery, Sum
-from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Length
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from rest_framework.exceptions import PermissionDenied
+from brands.models import Brand
 from brands.services import BrandSelector
 from carts.models import CartItem
 from common.api.exceptions import Conflict
-from utils.storage import SupabaseStorageService
+from common.lru_cache import RefreshingLRUCache
+from utils.storage import get_storage_service
 from common.validators import validate_file_format
 from addresses import models as addresses_models
 from . import models as product_models
+from .cache import product_detail_cache
 
 
 MAX_ALBUM_ITEMS = 3
 
+# lower bounds of the price histogram buckets of the product facets
+PRICE_BUCKETS = [0, 50, 100, 250, 500, 1000, 2500, 5000]
+
+# hot prefixes of the typeahead suggestions
+suggestions_cache = RefreshingLRUCache(
+    maxsize=settings.SUGGESTIONS_CACHE_SIZE,
+    refresh_interval=settings.SUGGESTIONS_CACHE_REFRESH_INTERVAL,
+)
+
 
 class ProductService:
     def __init__(self) -> None:
-        self.supabase = SupabaseStorageService()
+        self.storage = get_storage_service()
+        self.selector = ProductSelector()
         self.brand_selector = BrandSelector()
         self.album_service = AlbumService()
 
@@ -61,14 +92,18 @@ class ProductService:
             for key, val in data.items():
                 product.__setattr__(key, val)
             product.full_clean()
-            product.save()
+            # explicit update fields to not overwrite the maintained total_quantity
+            if data:
+                product.save(update_fields=list(data.keys()))
+            product_detail_cache.invalidate(product.pk)
 
     def delete(self, product: product_models.Product):
         with transaction.atomic():
             product_models.FavoriteItem.objects.filter(product_id=product.pk).delete()
             CartItem.objects.filter(product_id=product.pk).delete()
             product.is_active = False
-            product.save()
+            product.save(update_fields=["is_active"])
+            product_detail_cache.invalidate(product.pk)
 
     def add_inventory(self, product_pk, inventory_data: List[Dict]):
         for item in inventory_data:
@@ -76,6 +111,19 @@ class ProductService:
             product_models.Inventory.objects.create(
                 product_id=product_pk, store_id=store_pk, quantity=quantity
             )
+        self.refresh_total_quantity(product_pk)
+
+    def refresh_total_quantity(self, product_pk):
+        """Recalculate the product total_quantity from its inventories"""
+        total_quantity = (
+            product_models.Inventory.objects.filter(product_id=OuterRef("pk"))
+            .values("product_id")
+            .annotate(total=Sum("quantity"))
+            .values("total")
+        )
+        product_models.Product.objects.filter(pk=product_pk).update(
+            total_quantity=Coalesce(Subquery(total_quantity), 0)
+        )
 
     def _validate_inventory(self, inventory: List[Dict], distributor_pk):
         stores = [inv["store_pk"] for inv in inventory]
@@ -93,18 +141,33 @@ class ProductService:
         if stores_num != len(stores):
             raise ValidationError("Invalid stores provided")
 
-    def bulk_add_to_favorite(self, product_ids: List[int], customer_pk: int):
-        exist_items = product_models.FavoriteItem.objects.filter(
-            product_id__in=product_ids
-        ).values("product_id")
-        exist_items = [r["product_id"] for r in exist_items]
-        product_ids = set(product_ids).difference(set(exist_items))
-        items = []
-        for pk in product_ids:
-            item = product_models.FavoriteItem(product_id=pk, customer_id=customer_pk)
-            item.full_clean()
-            items.append(item)
-        product_models.FavoriteItem.objects.bulk_create(items)
+    def bulk_add_to_favorite(
+        self, product_ids: List[int], customer_pk: int
+    ) -> Dict[int, str]:
+        """Add the products to the customer favorites, return the outcome per
+        product id, "created" or "exists" """
+        product_ids = list(dict.fromkeys(product_ids))
+        self.selector.validate_product_ids(product_ids)
+
+        values = ", ".join(["(%s, %s)"] * len(product_ids))
+        params = []
+        for product_id in product_ids:
+            params.extend([product_id, customer_pk])
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO products_favoriteitem (product_id, customer_id)
+                VALUES {values}
+                ON CONFLICT (product_id, customer_id) DO NOTHING
+                RETURNING product_id
+                """,
+                params,
+            )
+            created = {row[0] for row in cursor.fetchall()}
+        return {
+            product_id: "created" if product_id in created else "exists"
+            for product_id in product_ids
+        }
 
     def add_to_favorite(self, product_id: int, customer_id: int):
         favorite_item = product_models.FavoriteItem(
@@ -119,26 +182,30 @@ class ProductService:
 
 class ProductSelector:
     def __init__(self):
-        self.supabase = SupabaseStorageService()
-
-    def product_list(self, search: str = None, ordering: List[str] = None, **filters):
+        self.storage = get_storage_service()
+
+    def product_list(
+        self,
+        search: str = None,
+        ordering: List[str] = None,
+        in_stock: bool = None,
+        **filters,
+    ):
         products = product_models.Product.objects.filter(**filters)
+        if in_stock is not None:
+            stock_filter = {"total_quantity__gt" if in_stock else "total_quantity": 0}
+            products = products.filter(**stock_filter)
         if search:
             search_str = search.replace(" ", " | ")
             query = SearchQuery(search_str, search_type="raw")
-            vector = SearchVector("name", "description", config="english")
-            search_result = (
-                product_models.Product.objects.annotate(search=vector)
-                .filter(search=query)
-                .values("id")
-            )
-
-            rank_vector = SearchVector("name", weight="A") + SearchVector(
-                "description", weight="B"
+            # ts_rank returns a real, cast to double precision so the rank held
+            # by a keyset cursor (a python float) compares equal to the row value
+            rank = Cast(
+                SearchRank(F("search_vector"), query, weights=[0.2, 0.4, 0.6, 0.8]),
+                FloatField(),
             )
-            rank = SearchRank(rank_vector, query, weights=[0.2, 0.4, 0.6, 0.8])
             products = (
-                products.filter(id__in=search_result)
+                products.filter(search_vector=query)
                 .annotate(rank=rank)
                 .filter(rank__gte=0.3)
                 .order_by("-rank")
@@ -151,13 +218,74 @@ class ProductSelector:
 
         return products
 
+    def product_facets(self, **params) -> Dict:
+        """Brand, sub category and price bucket counts of the products matching
+        the product list parameters. Cached briefly per normalized parameters"""
+        params.pop("ordering", None)
+        normalized_params = json.dumps(params, sort_keys=True, default=str)
+        params_hash = hashlib.md5(normalized_params.encode("utf-8")).hexdigest()
+        return cache.get_or_set(
+            f"product_facets:{params_hash}",
+            lambda: self._compute_product_facets(**params),
+            settings.PRODUCT_FACETS_CACHE_TIMEOUT,
+        )
+
+    def _compute_product_facets(self, **params) -> Dict:
+        # product_list orders by search rank, grouping must not include it
+        products = self.product_list(**params).order_by()
+
+        brands = (
+            products.values("brand_id", brand_name=F("brand__name"))
+            .annotate(count=Count("id"))
+            .order_by("-count", "brand_id")
+        )
+        sub_categories = (
+            products.values("sub_category_id", sub_category_name=F("sub_category__name"))
+            .annotate(count=Count("id"))
+            .order_by("-count", "sub_category_id")
+        )
+
+        bucket = Case(
+            *[
+                When(price__gte=lower_bound, then=Value(index))
+                for index, lower_bound in reversed(list(enumerate(PRICE_BUCKETS)))
+            ],
+            output_field=IntegerField(),
+        )
+        bucket_counts = (
+            products.annotate(bucket=bucket)
+            .values("bucket")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        bucket_counts = {row["bucket"]: row["count"] for row in bucket_counts}
+        upper_bounds = PRICE_BUCKETS[1:] + [None]
+        price_buckets = [
+            {"min": lower_bound, "max": upper_bound, "count": bucket_counts.get(i, 0)}
+            for i, (lower_bound, upper_bound) in enumerate(
+                zip(PRICE_BUCKETS, upper_bounds)
+            )
+        ]
+
+        return {
+            "brands": list(brands),
+            "sub_categories": list(sub_categories),
+            "price_buckets": price_buckets,
+        }
+
     def category_product_list(self, category_pk: int, **filters):
-        sub_categories = product_models.SubCategory.objects.filter(
-            category_id=category_pk
-        ).values("id")
-        return self.product_list(
-            sub_category_id__in=Subquery(sub_categories), **filters
+        return self.product_list(category_id=category_pk, **filters)
+
+    def with_list_related(self, queryset, lookup: str = ""):
+        """Load brands and cover images of the products
+        (reached through `lookup` if given) in a constant number of queries"""
+        prefix = f"{lookup}__" if lookup else ""
+        cover_items = Prefetch(
+            f"{prefix}album_items",
+            queryset=product_models.AlbumItem.objects.filter(is_cover=True),
+            to_attr="cover_items",
         )
+        return queryset.select_related(f"{prefix}brand").prefetch_related(cover_items)
 
     def get_cover_image_url(self, product_pk):
         cover_image_item = product_models.AlbumItem.objects.get(
@@ -167,7 +295,7 @@ class ProductSelector:
 
     def get_image_url(self, path: str) -> str:
         duration = timedelta(days=2).total_seconds()
-        url = self.supabase.get_url("images", path, duration)
+        url = self.storage.get_url("images", path, duration)
         return url
 
     def favorite_item_list(self, **filters):
@@ -175,10 +303,13 @@ class ProductSelector:
         return items
 
     def get_total_quantity(self, product_id: int):
-        total_quantity = product_models.Inventory.objects.filter(
-            product_id=product_id
-        ).aggregate(total=Sum("quantity", default=0))["total"]
-        return total_quantity
+        """Quantity available for new orders, the stock not reserved yet"""
+        total_quantity = (
+            product_models.Product.objects.filter(pk=product_id)
+            .values_list(F("total_quantity") - F("reserved_quantity"), flat=True)
+            .first()
+        )
+        return total_quantity or 0
 
     def get_inventory(self, product_id: int):
         inventory = product_models.Inventory.objects.filter(
@@ -195,6 +326,80 @@ class ProductSelector:
     def get_product(self, **criteria):
         return product_models.Product.objects.get(**criteria)
 
+    def validate_product_ids(self, product_ids: List[int]):
+        """Raise ValidationError unless all the ids are of active products"""
+        if not product_ids:
+            raise ValidationError("No products provided")
+        active_ids = set(
+            product_models.Product.objects.filter(
+                pk__in=product_ids, is_active=True
+            ).values_list("id", flat=True)
+        )
+        invalid_ids = [pk for pk in product_ids if pk not in active_ids]
+        if invalid_ids:
+            raise ValidationError(f"Invalid products: {invalid_ids}")
+
+    def get_order_snapshot(self, product_ids: List[int]) -> Dict[int, Dict]:
+        """Active status, price and available quantity of the products keyed
+        by product id, read in one query for order validation and pricing"""
+        products = product_models.Product.objects.filter(pk__in=product_ids).values(
+            "id",
+            "is_active",
+            "price",
+            available_quantity=F("total_quantity") - F("reserved_quantity"),
+        )
+        return {product["id"]: product for product in products}
+
+
+class SuggestionSelector:
+    def suggest(self, prefix: str, limit: int = 10) -> Dict:
+        """Top product and brand names having a word that starts with `prefix`"""
+        prefix = " ".join(prefix.lower().split())
+        return suggestions_cache.get(
+            (prefix, limit), lambda: self._find_suggestions(prefix, limit)
+        )
+
+    def _find_suggestions(self, prefix: str, limit: int) -> Dict:
+        products = product_models.Product.objects.filter(is_active=True)
+        return {
+            "products": self._match_names(products, prefix, limit),
+            "brands": self._match_names(Brand.objects.all(), prefix, limit),
+        }
+
+    def _match_names(self, queryset, prefix: str, limit: int) -> List[Dict]:
+        """
+        Names starting with `prefix` first, then the names having a later word
+        starting with it, shortest first. The two are separate queries, an OR
+        of both lookups can't be served by an index and the word lookup is
+        only needed when the names starting with `prefix` don't fill `limit`.
+        """
+        by_length = (Length("name"), "name")
+        matches = list(
+            queryset.filter(name__istartswith=prefix)
+            .order_by(*by_length)
+            .values("id", "name")[:limit]
+        )
+        if len(matches) < limit:
+            word_matches = (
+                queryset.annotate(name_words=SearchVector("name", config="simple"))
+                .filter(name_words=self._word_prefix_query(prefix))
+                .exclude(id__in=[match["id"] for match in matches])
+                .order_by(*by_length)
+                .values("id", "name")[: limit - len(matches)]
+            )
+            matches.extend(word_matches)
+        return matches
+
+    def _word_prefix_query(self, prefix: str) -> SearchQuery:
+        """Consecutive words of the name matching the words of `prefix`, the
+        last one as a prefix"""
+        words = [
+            "'{}'".format(word.replace("\\", "\\\\").replace("'", "''"))
+            for word in prefix.split()
+        ]
+        words[-1] += ":*"
+        return SearchQuery(" <-> ".join(words), search_type="raw", config="simple")
+
 
 class AlbumService:
     def add_album_items(self, product_pk, album_items_data: List[Dict]):
@@ -229,6 +434,7 @@ class AlbumService:
                 ).update(is_cover=False)
             album_item.full_clean()
             album_item.save()
+            product_detail_cache.invalidate(product_pk)
 
     def update_album_item(self, album_item: product_models.AlbumItem, data: Dict):
         with transaction.atomic():
@@ -242,11 +448,13 @@ class AlbumService:
                 validate_file_format(album_item.image, ["png", "jpg", "jpeg"])
             album_item.full_clean()
             album_item.save()
+            product_detail_cache.invalidate(album_item.product_id)
 
     def delete_album_item(self, album_item: product_models.AlbumItem):
         if album_item.is_cover:
             raise Conflict("Can't delete the cover image")
         album_item.delete()
+        product_detail_cache.invalidate(album_item.product_id)
 
 
     def _validate_album_items(self, album_items_data: List[Dict]):
@@ -6,7 +6,14 @@ app_name = "products"
 
 urlpatterns = [
     path("", views.ProductListCreateView().as_view(), name="products"),
+    path("facets", views.ProductFacetsView().as_view(), name="product_facets"),
+    path("suggest", views.SuggestionListView().as_view(), name="suggestions"),
     path("<int:pk>", views.ProductDetailView().as_view(), name="product"),
+    path(
+        "cache-stats",
+        views.ProductDetailCacheStatsView().as_view(),
+        name="product_detail_cache_stats",
+    ),
     path(
         "<int:pk>/album-items",
         views.AlbumItemListCreate().as_view(),
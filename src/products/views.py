@@ -2,7 +2,7 @@ from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.exceptions import PermissionDenied
 from common.api.permissions import DistributorsOnly, CustomersOnly
@@ -11,6 +11,7 @@ from common.api.parsers import MultipartJsonParser
 from . import models
 from . import serializers
 from . import services
+from .cache import product_detail_cache
 
 
 class ProductListCreateView(APIView):
@@ -44,7 +45,7 @@ class ProductListCreateView(APIView):
         products = selector.product_list(**query_params.validated_data, is_active=True)
 
         paginator = ProductPagination()
-        products = products.prefetch_related("brand")
+        products = selector.with_list_related(products)
         paginated_dataset = paginator.paginate_queryset(products, request)
 
         serializer = serializers.ProductListOutSerializer(
@@ -54,17 +55,64 @@ class ProductListCreateView(APIView):
         return paginated_response
 
 
+class ProductFacetsView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, **kwargs):
+        query_params = serializers.ProductListQueryParametersSerializer(
+            data=request.query_params
+        )
+        query_params.is_valid(raise_exception=True)
+
+        selector = services.ProductSelector()
+        facets = selector.product_facets(**query_params.validated_data, is_active=True)
+
+        return Response(data=facets, status=status.HTTP_200_OK)
+
+
+class SuggestionListView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, **kwargs):
+        query_params = serializers.SuggestionQueryParametersSerializer(
+            data=request.query_params
+        )
+        query_params.is_valid(raise_exception=True)
+
+        selector = services.SuggestionSelector()
+        suggestions = selector.suggest(**query_params.validated_data)
+
+        return Response(data=suggestions, status=status.HTTP_200_OK)
+
+
 class ProductDetailView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request, **kwargs):
         pk = kwargs["pk"]
-        product = get_object_or_404(models.Product, pk=pk, is_active=True)
-        serializer = serializers.ProductOutSerializer(
-            product, context={"request": request}
+
+        def build():
+            # only queried on a miss, deleting a product invalidates its payload
+            products = models.Product.objects.select_related(
+                "brand", "sub_category", "category"
+            )
+            product = get_object_or_404(products, pk=pk, is_active=True)
+            return serializers.ProductOutSerializer(
+                product, context={"request": request}
+            ).data
+
+        data = product_detail_cache.get_or_set(
+            pk, request.build_absolute_uri("/"), build
         )
 
-        return Response(serializer.data)
+        return Response(data)
+
+
+class ProductDetailCacheStatsView(APIView):
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get(self, request, **kwargs):
+        return Response(product_detail_cache.stats())
 
 
 class FavoriteItemListCreate(APIView):
@@ -80,12 +128,18 @@ class FavoriteItemListCreate(APIView):
         serializer = serializers.FavoriteItemInputSerializer(data=request.data)
         serializer.is_valid()
         service = services.ProductService()
-        service.bulk_add_to_favorite(
+        outcomes = service.bulk_add_to_favorite(
             serializer.validated_data["product_ids"], customer_pk
         )
 
         return Response(
-            data={"message": "Favorite items added successfully"},
+            data={
+                "message": "Favorite items added successfully",
+                "results": [
+                    {"product_id": product_id, "status": outcome}
+                    for product_id, outcome in outcomes.items()
+                ],
+            },
             status=status.HTTP_201_CREATED,
         )
 
@@ -95,10 +149,9 @@ class FavoriteItemListCreate(APIView):
             raise PermissionDenied("Can't access cart Items of another user")
 
         selector = services.ProductSelector()
-        cart_items = selector.favorite_item_list(customer_id=customer_pk)
-        cart_items.prefetch_related("product")
+        favorite_items = selector.favorite_item_list(customer_id=customer_pk)
         serializer = serializers.FavoriteItemOutSerializer(
-            instance=cart_items, many=True, context={"request": request}
+            instance=favorite_items, many=True, context={"request": request}
         )
         data = {"favorite_items": serializer.data}
 
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from products.models import Product
+from reviews.services import ReviewService
+
+
+class Command(BaseCommand):
+    help = "Recompute the rating aggregates of products from their reviews"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        service = ReviewService()
+        updated, last_pk = 0, 0
+        while True:
+            batch = list(
+                Product.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            updated += service.rebuild_ratings(batch)
+            last_pk = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} products"))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.15 on 2026-10-18 09:45
+
+from django.db import migrations
+
+
+BACKFILL_RATINGS_SQL = """
+UPDATE products_product AS product
+SET ratings_count = stats.ratings_count,
+    ratings_sum = stats.ratings_sum,
+    rating_1_count = stats.rating_1_count,
+    rating_2_count = stats.rating_2_count,
+    rating_3_count = stats.rating_3_count,
+    rating_4_count = stats.rating_4_count,
+    rating_5_count = stats.rating_5_count,
+    rating = stats.ratings_sum::numeric / stats.ratings_count
+FROM (
+    SELECT product_id,
+           COUNT(*) AS ratings_count,
+           SUM(rating) AS ratings_sum,
+           COUNT(*) FILTER (WHERE rating = 1) AS rating_1_count,
+           COUNT(*) FILTER (WHERE rating = 2) AS rating_2_count,
+           COUNT(*) FILTER (WHERE rating = 3) AS rating_3_count,
+           COUNT(*) FILTER (WHERE rating = 4) AS rating_4_count,
+           COUNT(*) FILTER (WHERE rating = 5) AS rating_5_count
+    FROM reviews_review
+    GROUP BY product_id
+) AS stats
+WHERE stats.product_id = product.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0001_initial'),
+        ('products', '0017_product_ratings'),
+    ]
+
+    operations = [
+        migrations.RunSQL(BACKFILL_RATINGS_SQL, migrations.RunSQL.noop),
+    ]
@@ -1,10 +1,24 @@
-from typing import Dict, List, Union
+from decimal import Decimal
+from typing import Dict, Iterable, List, Union
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
 from rest_framework.exceptions import PermissionDenied
 from common.api.exceptions import Conflict
 from orders.models import Order
+from products.cache import product_detail_cache
+from products.models import Product
 from reviews.models import Review
 
 
+RATING_FIELDS = [
+    "ratings_count",
+    "ratings_sum",
+    *[f"rating_{rating}_count" for rating in range(1, 6)],
+]
+
+
 class ReviewService:
     def __init__(self) -> None:
         self.selector = ReviewSelector()
@@ -22,16 +36,89 @@ class ReviewService:
             **review_data,
         )
         review.full_clean()
-        review.save()
+        with transaction.atomic():
+            review.save()
+            self._update_ratings(product_pk, added=review.rating)
 
     def update(self, review: Review, **data: Dict):
+        old_rating = review.rating
         for key, val in data.items():
             setattr(review, key, val)
         review.full_clean()
-        review.save()
+        with transaction.atomic():
+            review.save()
+            if review.rating != old_rating:
+                self._update_ratings(
+                    review.product_id, added=review.rating, removed=old_rating
+                )
     
     def delete(self, review: Review):
-        review.delete()
+        with transaction.atomic():
+            review.delete()
+            self._update_ratings(review.product_id, removed=review.rating)
+
+    def rebuild_ratings(self, product_ids: Iterable[int]) -> int:
+        """Recompute the rating aggregates of the products from their reviews"""
+        product_ids = list(product_ids)
+        stats = {
+            row.pop("product_id"): row
+            for row in Review.objects.filter(product_id__in=product_ids)
+            .order_by()
+            .values("product_id")
+            .annotate(
+                ratings_count=Count("id"),
+                ratings_sum=Sum("rating"),
+                **{
+                    f"rating_{rating}_count": Count("id", filter=Q(rating=rating))
+                    for rating in range(1, 6)
+                },
+            )
+        }
+        products = []
+        for product_id in product_ids:
+            product_stats = stats.get(product_id, {})
+            product = Product(pk=product_id)
+            for field in RATING_FIELDS:
+                setattr(product, field, product_stats.get(field, 0))
+            product.rating = (
+                Decimal(product.ratings_sum) / product.ratings_count
+                if product.ratings_count else 0
+            )
+            products.append(product)
+        Product.objects.bulk_update(products, [*RATING_FIELDS, "rating"])
+        for product_id in product_ids:
+            product_detail_cache.invalidate(product_id)
+        return len(products)
+
+    def _update_ratings(self, product_pk: int, added: int = None, removed: int = None):
+        """Apply a rating change to the product aggregates in one update so
+        concurrent reviews don't overwrite each other"""
+        count_delta = (added is not None) - (removed is not None)
+        sum_delta = (added or 0) - (removed or 0)
+        updates = {
+            "ratings_count": F("ratings_count") + count_delta,
+            "ratings_sum": F("ratings_sum") + sum_delta,
+        }
+        if added is not None:
+            updates[f"rating_{added}_count"] = F(f"rating_{added}_count") + 1
+        if removed is not None:
+            # an unchanged rating was filtered out by the caller
+            updates[f"rating_{removed}_count"] = F(f"rating_{removed}_count") - 1
+        # the right hand side expressions read the values before the update
+        new_count = F("ratings_count") + count_delta
+        updates["rating"] = Case(
+            When(
+                GreaterThan(new_count, 0),
+                then=(
+                    Cast(F("ratings_sum") + sum_delta, DecimalField(max_digits=12, decimal_places=2))
+                    / new_count
+                ),
+            ),
+            default=Value(0),
+            output_field=DecimalField(max_digits=3, decimal_places=2),
+        )
+        Product.objects.filter(pk=product_pk).update(**updates)
+        product_detail_cache.invalidate(product_pk)
 
 
 class ReviewSelector:
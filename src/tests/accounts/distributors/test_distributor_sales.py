@@ -0,0 +1,71 @@
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from orders.models import DistributorSalesDaily
+from orders.services import OrderService
+from tests.factories.addresses_factories import PickupAddressFactory
+from tests.factories.orders_factories import OrderFactory, OrderItemFactory
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory, InventoryFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    generate_auth_token,
+    create_groups,
+)
+
+
+class DistributorSalesTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        cls.distributor = create_distributor("distributor@test.com")
+        cls.store = StoreFactory.create(distributor=cls.distributor)
+        cls.product = ProductFactory.create()
+        InventoryFactory.create(store=cls.store, product=cls.product, quantity=20)
+        cls.customer = create_customer("customer@test.com")
+        cls.pickup_address = PickupAddressFactory.create(customer=cls.customer)
+        cls.url = reverse("distributors:sales", kwargs={"pk": cls.distributor.pk})
+
+    def setUp(self) -> None:
+        token = generate_auth_token(self.distributor.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def place_paid_order(self, quantity, unit_price):
+        order = OrderFactory.create(customer=self.customer, pickup_address=self.pickup_address)
+        OrderItemFactory.create(
+            order=order, product=self.product, quantity=quantity, unit_price=unit_price
+        )
+        OrderService().handle_payment_intent_succeeded(order.pk)
+        return order
+
+    def test_rollup_updated_on_allocation(self):
+        self.place_paid_order(2, 10)
+        self.place_paid_order(3, 10)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]["day"], str(timezone.localdate()))
+        self.assertEqual(response.data[0]["units"], 5)
+        self.assertEqual(response.data[0]["revenue"], "50.00")
+
+    def test_rebuild(self):
+        self.place_paid_order(2, 10)
+        DistributorSalesDaily.objects.update(units=0, revenue=0)
+
+        call_command("rebuild_sales_rollups", stdout=StringIO())
+
+        rollup = DistributorSalesDaily.objects.get()
+        self.assertEqual(rollup.units, 2)
+        self.assertEqual(rollup.revenue, 20)
+
+    def test_not_same_distributor_failure(self):
+        distributor = create_distributor("distributor2@test.com")
+        token = generate_auth_token(distributor.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
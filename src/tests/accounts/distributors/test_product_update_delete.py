@@ -130,6 +130,14 @@ class ProductUpdateTests(APITestCase):
         response = self.client.patch(self.url, json_data, content_type='application/json')
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+    def test_update_inventory_total_quantity(self):
+        data = {"inventory": [{"store_pk": self.store.pk, "quantity": 7}]}
+        json_data = json.dumps(data)
+        response = self.client.patch(self.url, json_data, content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.total_quantity, 7)
+
 
 
 class ProductDeleteTests(APITestCase):
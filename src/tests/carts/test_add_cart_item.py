@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -67,10 +69,18 @@ class CartItemCreateTests(APITestCase):
         response = self.client.post(self.url, data=data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
-    def test_same_cart_item_failure(self):
-        CartItemFactory.create(product=self.product, customer=self.customer)
+    def test_same_cart_item_incremented(self):
+        cart_item = CartItemFactory.create(
+            product=self.product, customer=self.customer, quantity=2
+        )
         response = self.client.post(self.url, data=self.valid_data)
-        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["results"],
+            [{"product_id": self.product.pk, "status": "incremented"}],
+        )
+        cart_item.refresh_from_db()
+        self.assertEqual(cart_item.quantity, 3)
     
     def test_cart_item_add_success(self):
         response = self.client.post(self.url, data=self.valid_data)
@@ -84,5 +94,13 @@ class CartItemCreateTests(APITestCase):
 
         response = self.client.post(self.url, data=data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_add_query_count(self):
+        products = ProductFactory.create_batch(20)
+        data = {'product_ids': [product.pk for product in products]}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, data=data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertLess(len(queries.captured_queries), 10)
     
     # def test_quantity()
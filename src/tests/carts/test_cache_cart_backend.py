@@ -0,0 +1,136 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from carts.models import CartItem
+from carts.services import CartItemService, CartItemSelector
+from products.services import ProductService
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory, InventoryFactory
+from tests.factories.carts_factories import CartItemFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    generate_auth_token,
+    create_groups,
+)
+
+
+@override_settings(CART_BACKEND="carts.backends.CacheCartBackend")
+class CacheCartBackendTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        cls.product1 = ProductFactory.create(price=10)
+        cls.product2 = ProductFactory.create(price=20)
+        InventoryFactory.create(store=store, product=cls.product1, quantity=5)
+        InventoryFactory.create(store=store, product=cls.product2, quantity=5)
+        cls.customer = create_customer("customer@test.com")
+        cls.cart_item = CartItemFactory.create(
+            customer=cls.customer, product=cls.product1, quantity=2
+        )
+        cls.url = reverse("customers:cart_items", kwargs={"pk": cls.customer.pk})
+        cls.summary_url = reverse("customers:cart_summary", kwargs={"pk": cls.customer.pk})
+
+    def setUp(self) -> None:
+        cache.clear()
+        token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def test_add_is_kept_in_cache_until_flushed(self):
+        data = {"product_ids": [self.product1.pk, self.product2.pk]}
+        response = self.client.post(self.url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {"product_id": self.product1.pk, "status": "incremented"},
+                {"product_id": self.product2.pk, "status": "created"},
+            ],
+        )
+        self.assertFalse(CartItem.objects.filter(product=self.product2).exists())
+        self.cart_item.refresh_from_db()
+        self.assertEqual(self.cart_item.quantity, 2)
+
+        response = self.client.get(self.summary_url)
+        quantities = [item["quantity"] for item in response.data["cart_items"]]
+        self.assertEqual(quantities, [3, 1])
+
+        CartItemService().flush(self.customer.pk)
+        self.cart_item.refresh_from_db()
+        self.assertEqual(self.cart_item.quantity, 3)
+        self.assertTrue(CartItem.objects.filter(product=self.product2).exists())
+
+    def test_list_served_from_cache(self):
+        CartItemService().bulk_create([self.product2.pk], self.customer.pk)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["id"], item["quantity"]) for item in response.data["cart_items"]],
+            [(self.cart_item.pk, 2), (None, 1)],
+        )
+        self.assertFalse(CartItem.objects.filter(product=self.product2).exists())
+
+        CartItemService().flush(self.customer.pk)
+        response = self.client.get(self.url)
+        cart_item2 = CartItem.objects.get(product=self.product2)
+        self.assertEqual(
+            [item["id"] for item in response.data["cart_items"]],
+            [self.cart_item.pk, cart_item2.pk],
+        )
+
+    def test_detail_served_from_cache(self):
+        url = reverse(
+            "customers:cart_item",
+            kwargs={"pk": self.customer.pk, "cart_item_pk": self.cart_item.pk},
+        )
+        CartItemService().bulk_create([self.product1.pk], self.customer.pk)
+        response = self.client.get(url)
+        self.assertEqual(response.data["cart_item"]["quantity"], 3)
+
+        response = self.client.patch(url, data={"quantity": 4}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        cart_item = CartItemSelector().get_cart_item(self.customer.pk, self.cart_item.pk)
+        self.assertEqual(cart_item.quantity, 4)
+        self.cart_item.refresh_from_db()
+        self.assertEqual(self.cart_item.quantity, 2)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        # the row is only removed on flush but the item is no longer in the cart
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_flush_removes_deleted_items(self):
+        service = CartItemService()
+        service.bulk_create([self.product2.pk], self.customer.pk)
+        service.cart_item_delete(self.cart_item)
+        service.flush(self.customer.pk)
+        self.assertEqual(
+            list(CartItem.objects.filter(customer=self.customer).values_list("product_id", flat=True)),
+            [self.product2.pk],
+        )
+
+    def test_deleted_product_not_flushed(self):
+        service = CartItemService()
+        service.bulk_create([self.product2.pk], self.customer.pk)
+        ProductService().delete(self.product1)
+
+        summary = CartItemSelector().cart_summary(self.customer.pk)
+        self.assertEqual(
+            [item["product_id"] for item in summary["cart_items"]], [self.product2.pk]
+        )
+        service.flush(self.customer.pk)
+        self.assertEqual(
+            list(CartItem.objects.filter(customer=self.customer).values_list("product_id", flat=True)),
+            [self.product2.pk],
+        )
+
+    def test_clear_cart(self):
+        service = CartItemService()
+        service.clear_cart(self.customer.pk)
+        self.assertTrue(CartItem.objects.filter(customer=self.customer).exists())
+        service.flush(self.customer.pk)
+        self.assertFalse(CartItem.objects.filter(customer=self.customer).exists())
@@ -0,0 +1,56 @@
+from decimal import Decimal
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from carts.services import CartItemSelector
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory, InventoryFactory
+from tests.factories.carts_factories import CartItemFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    generate_auth_token,
+    create_groups,
+)
+
+
+class CartSummaryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        cls.product1 = ProductFactory.create(price=10)
+        cls.product2 = ProductFactory.create(price=25)
+        InventoryFactory.create(store=store, product=cls.product1, quantity=5)
+        InventoryFactory.create(store=store, product=cls.product2, quantity=1)
+        cls.customer = create_customer("customer@test.com")
+        CartItemFactory.create(customer=cls.customer, product=cls.product1, quantity=3)
+        CartItemFactory.create(customer=cls.customer, product=cls.product2, quantity=2)
+        cls.url = reverse("customers:cart_summary", kwargs={"pk": cls.customer.pk})
+
+    def setUp(self) -> None:
+        token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def test_summary(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        cart_items = response.data["cart_items"]
+        self.assertEqual(len(cart_items), 2)
+        self.assertEqual(cart_items[0]["line_total"], "30.00")
+        self.assertEqual(cart_items[0]["available_quantity"], 5)
+        self.assertEqual(cart_items[1]["available_quantity"], 1)
+        # the second line exceeds the available stock
+        self.assertEqual(Decimal(response.data["total_price"]), 30)
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            CartItemSelector().cart_summary(self.customer.pk)
+
+    def test_not_same_customer_failure(self):
+        customer = create_customer("customer2@test.com")
+        token = generate_auth_token(customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
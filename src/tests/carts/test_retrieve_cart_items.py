@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -70,3 +72,23 @@ class CartListTests(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {customer_token}")
         response = self.client.get(self.url)
         self.assertEqual(len(response.data['cart_items']), 1)
+
+    def test_queries_independent_of_cart_size(self):
+        customer_token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {customer_token}")
+        with CaptureQueriesContext(connection) as single_item_queries:
+            self.client.get(self.url)
+
+        for _ in range(5):
+            product = ProductFactory.create()
+            AlbumItemFactory.create(product=product, is_cover=True)
+            CartItemFactory.create(customer=self.customer, product=product)
+
+        with CaptureQueriesContext(connection) as many_items_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data["cart_items"]), 6)
+        self.assertEqual(
+            len(many_items_queries.captured_queries),
+            len(single_item_queries.captured_queries),
+        )
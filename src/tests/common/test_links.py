@@ -0,0 +1,25 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from common.api.links import LinkBuilder, get_link_builder, get_url_template
+
+
+class LinkBuilderTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.request = APIRequestFactory().get("/")
+
+    def test_url_template(self):
+        template = get_url_template("distributors:store", ("pk", "store_pk"))
+        self.assertEqual(template, "/api/distributors/{pk}/stores/{store_pk}")
+
+    def test_matches_reverse(self):
+        link_builder = LinkBuilder(self.request)
+        url = reverse("customers:address", kwargs={"pk": 3, "address_pk": 15})
+        self.assertEqual(
+            link_builder.build("customers:address", pk=3, address_pk=15),
+            self.request.build_absolute_uri(url),
+        )
+
+    def test_builder_shared_within_context(self):
+        context = {"request": self.request}
+        self.assertIs(get_link_builder(context), get_link_builder(context))
@@ -0,0 +1,32 @@
+from unittest import mock
+from django.test import SimpleTestCase
+from common.lru_cache import RefreshingLRUCache
+
+
+class RefreshingLRUCacheTests(SimpleTestCase):
+    def test_cached_value(self):
+        cache = RefreshingLRUCache(maxsize=2, refresh_interval=60)
+        loader = mock.Mock(return_value=1)
+        self.assertEqual(cache.get("a", loader), 1)
+        self.assertEqual(cache.get("a", loader), 1)
+        loader.assert_called_once()
+
+    def test_least_recently_used_evicted(self):
+        cache = RefreshingLRUCache(maxsize=2, refresh_interval=60)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)
+        cache.get("c", lambda: 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("a", lambda: None), 1)
+        self.assertIsNone(cache.get("b", lambda: None))
+
+    def test_refresh_stale_entries(self):
+        cache = RefreshingLRUCache(maxsize=2, refresh_interval=60)
+        with mock.patch("common.lru_cache.time.monotonic", return_value=0):
+            cache.get("a", lambda: 1)
+        with mock.patch("common.lru_cache.time.monotonic", return_value=30):
+            self.assertEqual(cache.get("a", lambda: 2), 1)
+        with mock.patch("common.lru_cache.time.monotonic", return_value=61):
+            self.assertEqual(cache.get("a", lambda: 2), 2)
@@ -0,0 +1,45 @@
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, override_settings
+from products.services import ProductSelector
+from utils.storage import LocalStorageService, get_storage_client
+
+
+class CountingStorageService(LocalStorageService):
+    signed_urls = 0
+
+    def create_signed_url(self, bucket, path, duration):
+        CountingStorageService.signed_urls += 1
+        return super().create_signed_url(bucket, path, duration)
+
+
+@override_settings(
+    STORAGE_SERVICE="tests.common.test_storage.CountingStorageService",
+    SIGNED_URL_EXPIRY_MARGIN=60,
+)
+class StorageServiceTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        CountingStorageService.signed_urls = 0
+        CountingStorageService().upload(ContentFile(b"image", name="a.png"), "images")
+
+    def test_signed_url_cached(self):
+        selector = ProductSelector()
+        url = selector.get_image_url("a.png")
+        self.assertTrue(url.startswith("/local-storage/images/a.png"))
+        self.assertEqual(ProductSelector().get_image_url("a.png"), url)
+        self.assertEqual(CountingStorageService.signed_urls, 1)
+
+    def test_short_lived_url_not_cached(self):
+        storage = CountingStorageService()
+        storage.get_url("images", "a.png", 60)
+        storage.get_url("images", "a.png", 60)
+        self.assertEqual(CountingStorageService.signed_urls, 2)
+
+    def test_missing_file(self):
+        storage = CountingStorageService()
+        self.assertIsNone(storage.get_url("images", "missing.png", 3600))
+        self.assertIsNone(cache.get(storage._signed_url_key("images", "missing.png", 3600)))
+
+    def test_shared_client(self):
+        self.assertIs(get_storage_client(), get_storage_client())
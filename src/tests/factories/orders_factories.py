@@ -38,4 +38,9 @@ def create_test_order(
     OrderItemStoreFactory.create(
         order_item=order_item, store=store, reserved_quantity=quantity
     )
+    order.total_price = order_item.unit_price * quantity
+    order.items_count = quantity
+    models.Order.objects.filter(pk=order.pk).update(
+        total_price=order.total_price, items_count=order.items_count
+    )
     return order
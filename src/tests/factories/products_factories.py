@@ -1,4 +1,5 @@
 import factory
+from django.db.models import F
 from faker import Faker
 from products import models
 from tests.factories.brand_related_factories import BrandFactory
@@ -38,6 +39,16 @@ class InventoryFactory(factory.django.DjangoModelFactory):
     # store is assigned manually
     quantity = factory.lazy_attribute(lambda _: faker.random_number(digits=3))
 
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        """Keep the product total_quantity in sync as ProductService does"""
+        inventory = super()._create(model_class, *args, **kwargs)
+        models.Product.objects.filter(pk=inventory.product_id).update(
+            total_quantity=F("total_quantity") + inventory.quantity
+        )
+        inventory.product.refresh_from_db(fields=["total_quantity"])
+        return inventory
+
 
 class AlbumItemFactory(factory.django.DjangoModelFactory):
     class Meta:
@@ -0,0 +1,45 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from orders.models import Order
+from tests.factories.addresses_factories import PickupAddressFactory
+from tests.factories.orders_factories import OrderItemFactory, create_test_order
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    create_groups,
+)
+
+
+class BackfillOrderTotalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        customer = create_customer("customer@test.com")
+        pickup_address = PickupAddressFactory.create(customer=customer)
+        cls.product = ProductFactory.create()
+        cls.orders = [
+            create_test_order(customer, pickup_address, cls.product, 2, store)
+            for _ in range(3)
+        ]
+        cls.order_item = OrderItemFactory.create(
+            order=cls.orders[0], product=ProductFactory.create(), quantity=3, unit_price=10
+        )
+        Order.objects.update(total_price=0, items_count=0)
+
+    def test_backfill(self):
+        call_command("backfill_order_totals", batch_size=2, stdout=StringIO())
+
+        for order in self.orders:
+            order.refresh_from_db()
+            order_item = order.orderitem_set.get(product=self.product)
+            expected_total = order_item.unit_price * 2
+            expected_count = 2
+            if order == self.orders[0]:
+                expected_total += 30
+                expected_count += 3
+            self.assertEqual(order.total_price, expected_total)
+            self.assertEqual(order.items_count, expected_count)
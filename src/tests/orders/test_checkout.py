@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from carts.models import CartItem
+from carts.services import CartItemService
+from orders.models import Order, StockReservation
+from tests.factories.carts_factories import CartItemFactory
+from tests.factories.products_factories import ProductFactory, InventoryFactory
+from tests.factories.store_factories import StoreFactory
+from tests.factories.addresses_factories import PickupAddressFactory
+from tests.factories.auth_factories import (
+    create_distributor,
+    generate_all_users_except,
+    generate_auth_token,
+    create_groups,
+    create_customer,
+)
+
+
+@override_settings(PAYMENT_GATEWAY="orders.payments.FakePaymentGateway")
+class CheckoutTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        cls.product = ProductFactory.create(price=10)
+        cls.product2 = ProductFactory.create(price=15)
+        InventoryFactory.create(store=store, product=cls.product, quantity=10)
+        InventoryFactory.create(store=store, product=cls.product2, quantity=1)
+
+        cls.customer = create_customer("customer@gmail.com")
+        cls.pickup_address = PickupAddressFactory.create(customer=cls.customer)
+        cls.url = reverse("customers:checkout", kwargs={"pk": cls.customer.pk})
+        cls.data = {"pickup_address_id": cls.pickup_address.pk}
+
+    def setUp(self) -> None:
+        cache.clear()
+        CartItemFactory.create(customer=self.customer, product=self.product, quantity=3)
+        token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def test_unauthorized_failure(self):
+        users = generate_all_users_except("Customer")
+        for user in users:
+            if hasattr(user, "user"):
+                token = generate_auth_token(user=user.user)
+            else:
+                token = generate_auth_token(user=user)
+
+            self.client.credentials(HTTP_AUTHORIZATION="Token " + token)
+            response = self.client.post(self.url, self.data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_another_customer_failure(self):
+        customer2 = create_customer("customer2@gmail.com")
+        url = reverse("customers:checkout", kwargs={"pk": customer2.pk})
+        response = self.client.post(url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_success_checkout(self):
+        response = self.client.post(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn("client_secret", response.data)
+
+        order = Order.objects.get(customer=self.customer)
+        self.assertEqual(order.total_price, 30)
+        self.assertEqual(order.items_count, 3)
+        self.assertEqual(
+            list(order.orderitem_set.values_list("product_id", "quantity", "unit_price")),
+            [(self.product.pk, 3, 10)],
+        )
+        self.assertTrue(StockReservation.objects.filter(order=order).exists())
+        self.assertFalse(CartItem.objects.filter(customer=self.customer).exists())
+
+    def test_empty_cart_failure(self):
+        CartItem.objects.filter(customer=self.customer).delete()
+        response = self.client.post(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_not_enough_inventory_keeps_cart(self):
+        CartItemFactory.create(customer=self.customer, product=self.product2, quantity=2)
+        response = self.client.post(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(CartItem.objects.filter(customer=self.customer).count(), 2)
+
+    def test_invalid_pickup_address(self):
+        address = PickupAddressFactory.create(customer=create_customer("other@gmail.com"))
+        response = self.client.post(
+            self.url, {"pickup_address_id": address.pk}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    @override_settings(
+        PAYMENT_GATEWAY="tests.orders.test_place_order.FailingPaymentGateway"
+    )
+    def test_payment_gateway_failure_keeps_cart(self):
+        response = self.client.post(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(
+            list(CartItem.objects.filter(customer=self.customer).values_list("quantity", flat=True)),
+            [3],
+        )
+
+    @override_settings(CART_BACKEND="carts.backends.CacheCartBackend")
+    def test_checkout_cached_cart(self):
+        CartItemService().bulk_create([self.product2.pk], self.customer.pk)
+        response = self.client.post(self.url, self.data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        order = Order.objects.get(customer=self.customer)
+        self.assertEqual(order.items_count, 4)
+        self.assertFalse(CartItem.objects.filter(customer=self.customer).exists())
+        self.assertEqual(
+            CartItemService().backend.get_items(self.customer.pk), []
+        )
@@ -0,0 +1,83 @@
+import csv
+import json
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from tests.factories.addresses_factories import PickupAddressFactory
+from tests.factories.orders_factories import create_test_order
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    create_delivery,
+    generate_auth_token,
+    create_groups,
+)
+
+
+class OrderExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        cls.product = ProductFactory.create(name="Samsung new phone")
+        cls.customer = create_customer("customer@test.com")
+        pickup_address = PickupAddressFactory.create(customer=cls.customer)
+        cls.orders = [
+            create_test_order(cls.customer, pickup_address, cls.product, 2, store)
+            for _ in range(3)
+        ]
+        customer2 = create_customer("customer2@test.com")
+        create_test_order(
+            customer2,
+            PickupAddressFactory.create(customer=customer2),
+            cls.product,
+            1,
+            store,
+            status="placed",
+        )
+        cls.delivery = create_delivery("delivery@test.com")
+        cls.url = reverse("orders:orders_export")
+        cls.customer_url = reverse("customers:orders_export", kwargs={"pk": cls.customer.pk})
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_delivery_csv_export(self):
+        token = generate_auth_token(self.delivery)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+
+        rows = list(csv.DictReader(self.read(response).splitlines()))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["product_name"], "Samsung new phone")
+
+        response = self.client.get(self.url, QUERY_STRING="status=placed")
+        rows = list(csv.DictReader(self.read(response).splitlines()))
+        self.assertEqual(len(rows), 1)
+
+    def test_customer_ndjson_export(self):
+        token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get(self.customer_url, QUERY_STRING="file_type=ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row["order_id"] for row in rows], [order.pk for order in self.orders])
+        self.assertEqual(rows[0]["quantity"], 2)
+
+    def test_not_same_customer_failure(self):
+        customer = create_customer("customer3@test.com")
+        token = generate_auth_token(customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get(self.customer_url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_file_type(self):
+        token = generate_auth_token(self.delivery)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        response = self.client.get(self.url, QUERY_STRING="file_type=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
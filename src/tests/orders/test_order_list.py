@@ -1,6 +1,7 @@
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from orders.models import Order
 from tests.factories.addresses_factories import PickupAddressFactory
 from tests.factories.orders_factories import create_test_order
 from tests.factories.store_factories import StoreFactory
@@ -74,3 +75,30 @@ class CustomerOrderListTests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(len(response.data['results']), 1)
 
+
+    def test_cursor_pagination(self):
+        for _ in range(13):
+            create_test_order(
+                self.customer, self.pickup_address, self.product1, 1, self.store
+            )
+        customer_token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {customer_token}")
+        response = self.client.get(
+            self.url, QUERY_STRING="pagination=cursor&ordering=-ordered_at"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 12)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNone(response.data["next"])
+
+    def test_persisted_total_price(self):
+        customer_token = generate_auth_token(self.customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {customer_token}")
+        response = self.client.get(self.url)
+        order = response.data["results"][0]
+        self.assertEqual(order["items_count"], 5)
+        expected_total = Order.objects.get(customer=self.customer).total_price
+        self.assertEqual(order["total_price"], expected_total)
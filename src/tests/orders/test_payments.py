@@ -0,0 +1,54 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase
+from orders.payments import StripeGateway
+
+
+class StubPaymentIntentService:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def create(self, params=None, options=None):
+        self.calls.append((params, options))
+        return SimpleNamespace(id="pi_1", client_secret="pi_1_secret")
+
+
+class StubRefundService:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def create(self, params=None, options=None):
+        self.calls.append((params, options))
+
+
+class StubStripeClient:
+    """The StripeClient surface of the pinned stripe version, services are
+    attributes of the client itself"""
+
+    def __init__(self) -> None:
+        self.payment_intents = StubPaymentIntentService()
+        self.refunds = StubRefundService()
+
+
+class StripeGatewayTests(SimpleTestCase):
+    def test_create_payment_intent(self):
+        client = StubStripeClient()
+        with mock.patch("orders.payments.get_stripe_client", return_value=client):
+            intent = StripeGateway().create_payment_intent(7, Decimal("12.50"))
+
+        self.assertEqual(intent, {"id": "pi_1", "client_secret": "pi_1_secret"})
+        params, options = client.payment_intents.calls[0]
+        self.assertEqual(params["amount"], 1250)
+        self.assertEqual(params["metadata"], {"order_id": 7})
+        self.assertEqual(options, {"idempotency_key": "order-7-payment-intent"})
+
+    def test_refund_payment_intent(self):
+        client = StubStripeClient()
+        with mock.patch("orders.payments.get_stripe_client", return_value=client):
+            StripeGateway().refund_payment_intent(7, "pi_1")
+
+        self.assertEqual(
+            client.refunds.calls,
+            [({"payment_intent": "pi_1"}, {"idempotency_key": "order-7-refund"})],
+        )
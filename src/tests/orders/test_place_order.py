@@ -1,14 +1,19 @@
 import json
-from django.test import TestCase
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.db.models import Sum
 from rest_framework.test import APITestCase
 from rest_framework import status
-from orders.models import Order
+from rest_framework.exceptions import ValidationError
+from orders.models import Order, OrderItemStore, StockReservation
+from orders.payments import FakePaymentGateway, PaymentGateway
 from orders.services import MAX_ORDER_PRODUCTS, OrderService
-from products.models import Inventory
+from products.models import Inventory, Product
 from products.services import ProductService
-from tests.factories.orders_factories import create_test_order
+from tests.factories.orders_factories import OrderItemFactory, create_test_order
 from tests.factories.products_factories import AlbumItemFactory, ProductFactory, InventoryFactory
 from tests.factories.store_factories import StoreFactory
 from tests.factories.addresses_factories import PickupAddressFactory
@@ -21,6 +26,12 @@ from tests.factories.auth_factories import (
 )
 
 
+class FailingPaymentGateway(PaymentGateway):
+    def create_payment_intent(self, order_id, amount):
+        raise ConnectionError("gateway unavailable")
+
+
+@override_settings(PAYMENT_GATEWAY="orders.payments.FakePaymentGateway")
 class OrderCreateTests(APITestCase):
     @classmethod
     def setUpTestData(cls):
@@ -210,6 +221,128 @@ class OrderCreateTests(APITestCase):
 
         self.assertEqual(quantity_after, quantity_before)
 
+    def test_order_reserves_stock(self):
+        response = self.client.post(
+            self.url, self.json_data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, 2)
+
+        data = {
+            "order_items": [{"product_id": self.product.pk, "quantity": 9}],
+            "pickup_address_id": self.pickup_address.pk,
+        }
+        response = self.client.post(
+            self.url, json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_expired_reservations_released(self):
+        self.client.post(self.url, self.json_data, content_type="application/json")
+        StockReservation.objects.update(expires_at=timezone.now())
+
+        call_command("expire_stock_reservations", stdout=StringIO())
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, 0)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def place_order(self, quantity):
+        data = {
+            "order_items": [{"product_id": self.product.pk, "quantity": quantity}],
+            "pickup_address_id": self.pickup_address.pk,
+        }
+        response = self.client.post(
+            self.url, json.dumps(data), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Order.objects.filter(customer_id=self.customer.pk).latest("pk")
+
+    def test_paid_after_expiry_with_stock_taken_is_refunded(self):
+        expired_order = self.place_order(10)
+        StockReservation.objects.update(expires_at=timezone.now())
+        call_command("expire_stock_reservations", stdout=StringIO())
+        order = self.place_order(10)
+
+        service = OrderService()
+        service.handle_payment_intent_succeeded(expired_order.pk, "pi_expired")
+        expired_order.refresh_from_db()
+        self.assertEqual(expired_order.status, "cancelled")
+        self.assertEqual(FakePaymentGateway.refunds[expired_order.pk], "pi_expired")
+        self.assertFalse(OrderItemStore.objects.exists())
+
+        service.handle_payment_intent_succeeded(order.pk, "pi_order")
+        order.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertEqual(order.status, "placed")
+        self.assertNotIn(order.pk, FakePaymentGateway.refunds)
+        self.assertEqual(self.product.total_quantity, 0)
+        self.assertEqual(self.product.reserved_quantity, 0)
+        self.assertEqual(
+            OrderItemStore.objects.aggregate(total=Sum("reserved_quantity"))["total"], 10
+        )
+
+    def test_paid_after_expiry_with_stock_available_is_placed(self):
+        order = self.place_order(4)
+        StockReservation.objects.update(expires_at=timezone.now())
+        call_command("expire_stock_reservations", stdout=StringIO())
+
+        OrderService().handle_payment_intent_succeeded(order.pk, "pi_order")
+        order.refresh_from_db()
+        self.product.refresh_from_db()
+        self.assertEqual(order.status, "placed")
+        self.assertEqual(self.product.total_quantity, 6)
+
+    def test_payment_intent_idempotent_per_order(self):
+        response = self.client.post(
+            self.url, self.json_data, content_type="application/json"
+        )
+        order = Order.objects.filter(customer_id=self.customer.pk).latest("pk")
+        intent = FakePaymentGateway().create_payment_intent(order.pk, order.total_price)
+        self.assertEqual(response.data["client_secret"], intent["client_secret"])
+
+    @override_settings(
+        PAYMENT_GATEWAY="tests.orders.test_place_order.FailingPaymentGateway"
+    )
+    def test_payment_gateway_failure_discards_order(self):
+        response = self.client.post(
+            self.url, self.json_data, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(Order.objects.filter(customer_id=self.customer.pk).exists())
+        self.assertFalse(StockReservation.objects.exists())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.reserved_quantity, 0)
+
+
+class OrderValidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_groups()
+        cls.store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        cls.products = ProductFactory.create_batch(MAX_ORDER_PRODUCTS)
+        for product in cls.products:
+            InventoryFactory.create(store=cls.store, product=product, quantity=5)
+
+    def test_single_query_validation(self):
+        service = OrderService()
+        order_items = [
+            {"product_id": product.pk, "quantity": 5} for product in self.products
+        ]
+        with self.assertNumQueries(1):
+            products = service.product_selector.get_order_snapshot(
+                [item["product_id"] for item in order_items]
+            )
+            service._validate_order_items(order_items, products)
+
+    def test_not_enough_inventory(self):
+        service = OrderService()
+        order_items = [{"product_id": self.products[0].pk, "quantity": 6}]
+        products = service.product_selector.get_order_snapshot([self.products[0].pk])
+        with self.assertRaises(ValidationError):
+            service._validate_order_items(order_items, products)
+
 
 class PostSuccessfulPaymentTests(TestCase):
     
@@ -235,3 +368,47 @@ class PostSuccessfulPaymentTests(TestCase):
 
         self.assertEqual(self.order.status, "placed")
         self.assertEqual(self.inventory.quantity, 10)
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.total_quantity, 10)
+
+    def test_payment_converts_reservation(self):
+        Product.objects.filter(pk=self.product1.pk).update(reserved_quantity=5)
+        StockReservation.objects.create(
+            order=self.order, product=self.product1, quantity=5, expires_at=timezone.now()
+        )
+        OrderService().handle_payment_intent_succeeded(self.order.pk)
+
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.reserved_quantity, 0)
+        self.assertEqual(self.product1.total_quantity, 10)
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_allocation_across_stores(self):
+        store2 = StoreFactory.create(distributor=self.distributor)
+        product2 = ProductFactory.create()
+        inventory1 = InventoryFactory.create(store=self.store, product=product2, quantity=4)
+        inventory2 = InventoryFactory.create(store=store2, product=product2, quantity=6)
+        order_item = OrderItemFactory.create(product=product2, order=self.order, quantity=8)
+
+        OrderService().handle_payment_intent_succeeded(self.order.pk)
+
+        inventory1.refresh_from_db()
+        inventory2.refresh_from_db()
+        self.assertEqual(inventory1.quantity, 2)
+        self.assertEqual(inventory2.quantity, 0)
+        reserved = dict(
+            OrderItemStore.objects.filter(order_item=order_item).values_list(
+                "store_id", "reserved_quantity"
+            )
+        )
+        self.assertEqual(reserved, {store2.pk: 6, self.store.pk: 2})
+        product2.refresh_from_db()
+        self.assertEqual(product2.total_quantity, 2)
+
+    def test_duplicate_payment_event_allocates_once(self):
+        service = OrderService()
+        service.handle_payment_intent_succeeded(self.order.pk)
+        service.handle_payment_intent_succeeded(self.order.pk)
+
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.inventory.quantity, 10)
@@ -99,3 +99,60 @@ class OrderDetailsTests(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {delivery_token}")
         response = self.client.patch(self.url, data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OrderBulkStatusTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        product = ProductFactory.create()
+        customer = create_customer("customer@test.com")
+        pickup_address = PickupAddressFactory.create(customer=customer)
+        cls.placed_orders = [
+            create_test_order(customer, pickup_address, product, 1, store, "placed")
+            for _ in range(3)
+        ]
+        cls.pending_order = create_test_order(customer, pickup_address, product, 1, store)
+        cls.delivery = create_delivery("delivery@test.com")
+        cls.url = reverse("orders:orders_status")
+
+    def setUp(self) -> None:
+        token = generate_auth_token(self.delivery)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+
+    def test_bulk_transition(self):
+        order_ids = [order.pk for order in self.placed_orders]
+        data = {
+            "order_ids": order_ids + [self.pending_order.pk, 999999],
+            "status": "Shipped",
+        }
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], order_ids)
+        self.assertEqual(response.data["conflicts"], [self.pending_order.pk])
+        self.assertEqual(response.data["not_found"], [999999])
+
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.data["updated"], [])
+        self.assertEqual(len(response.data["conflicts"]), 4)
+
+    def test_invalid_status(self):
+        data = {"order_ids": [self.pending_order.pk], "status": "pending"}
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_placed_status_rejected(self):
+        data = {"order_ids": [self.pending_order.pk], "status": "placed"}
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.pending_order.refresh_from_db()
+        self.assertEqual(self.pending_order.status, "pending")
+
+    def test_non_delivery_failure(self):
+        customer = create_customer("customer2@test.com")
+        token = generate_auth_token(customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        data = {"order_ids": [self.pending_order.pk], "status": "placed"}
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,147 @@
+import hashlib
+import hmac
+import json
+import time
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from orders.models import WebhookEvent
+from orders.services import WebhookEventService
+from tests.factories.addresses_factories import PickupAddressFactory
+from tests.factories.orders_factories import create_test_order
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory, InventoryFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    create_groups,
+)
+
+
+def build_event(event_id, order_id):
+    return {
+        "id": event_id,
+        "type": "payment_intent.succeeded",
+        "data": {"object": {"metadata": {"order_id": str(order_id)}}},
+    }
+
+
+ENDPOINT_SECRET = "whsec_test"
+
+
+def sign_payload(payload, secret=ENDPOINT_SECRET):
+    timestamp = int(time.time())
+    signature = hmac.new(
+        secret.encode("utf-8"), f"{timestamp}.{payload}".encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+@override_settings(STRIPE_ENDPOINT_SECRET=ENDPOINT_SECRET, WEBHOOK_MAX_ATTEMPTS=2)
+class WebhookTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        product = ProductFactory.create()
+        cls.inventory = InventoryFactory.create(store=store, product=product, quantity=10)
+        customer = create_customer("customer@test.com")
+        pickup_address = PickupAddressFactory.create(customer=customer)
+        cls.order = create_test_order(customer, pickup_address, product, 4, store)
+        cls.url = reverse("orders:success_payment_handler")
+
+    def post_event(self, event, secret=ENDPOINT_SECRET):
+        payload = json.dumps(event)
+        return self.client.post(
+            self.url,
+            payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=sign_payload(payload, secret),
+        )
+
+    def test_signed_event_stored(self):
+        response = self.post_event(build_event("evt_1", self.order.pk))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        webhook_event = WebhookEvent.objects.get(event_id="evt_1")
+        self.assertEqual(webhook_event.payload, build_event("evt_1", self.order.pk))
+
+    def test_invalid_signature_rejected(self):
+        response = self.post_event(build_event("evt_1", self.order.pk), secret="whsec_other")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    @override_settings(STRIPE_ENDPOINT_SECRET="")
+    def test_missing_endpoint_secret_rejected(self):
+        response = self.client.post(
+            self.url, build_event("evt_1", self.order.pk), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_malformed_event_rejected(self):
+        response = self.post_event({"data": {}})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(WebhookEvent.objects.exists())
+
+    def test_redelivered_event_stored_once(self):
+        event = build_event("evt_1", self.order.pk)
+        for _ in range(2):
+            response = self.post_event(event)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(WebhookEvent.objects.filter(event_id="evt_1").count(), 1)
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.status, "pending")
+
+    def test_receive_reports_new_events(self):
+        service = WebhookEventService()
+        event = build_event("evt_1", self.order.pk)
+        self.assertTrue(service.receive(event))
+        self.assertFalse(service.receive(event))
+
+    def test_worker_processes_events(self):
+        self.post_event(build_event("evt_1", self.order.pk))
+        self.post_event(build_event("evt_2", self.order.pk))
+
+        call_command("process_webhook_events", stdout=StringIO())
+
+        self.order.refresh_from_db()
+        self.inventory.refresh_from_db()
+        self.assertEqual(self.order.status, "placed")
+        self.assertEqual(self.inventory.quantity, 6)
+        self.assertEqual(WebhookEvent.objects.filter(status="processed").count(), 2)
+
+    def test_claimed_events_skipped_until_lease_expires(self):
+        service = WebhookEventService()
+        service.receive(build_event("evt_1", self.order.pk))
+        # a worker dying after claiming the event
+        with mock.patch.object(WebhookEventService, "_process"):
+            self.assertEqual(service.process_batch(), 1)
+        self.assertEqual(service.process_batch(), 0)
+
+        WebhookEvent.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(service.process_batch(), 1)
+        self.assertEqual(WebhookEvent.objects.get().status, "processed")
+
+    def test_failed_event_retried_with_backoff(self):
+        event = build_event("evt_1", self.order.pk)
+        del event["data"]["object"]["metadata"]
+        service = WebhookEventService()
+        service.receive(event)
+
+        self.assertEqual(service.process_batch(), 1)
+        webhook_event = WebhookEvent.objects.get(event_id="evt_1")
+        self.assertEqual(webhook_event.status, "pending")
+        self.assertEqual(webhook_event.attempts, 1)
+        self.assertGreater(webhook_event.next_attempt_at, timezone.now())
+        self.assertEqual(service.process_batch(), 0)  # not due yet
+
+        WebhookEvent.objects.update(next_attempt_at=timezone.now())
+        service.process_batch()
+        webhook_event.refresh_from_db()
+        self.assertEqual(webhook_event.status, "failed")
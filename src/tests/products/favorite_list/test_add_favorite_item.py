@@ -80,4 +80,12 @@ class FavoriteItemCreateTests(APITestCase):
 
         response = self.client.post(self.url, data=data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-    
\ No newline at end of file
+    
+    def test_existing_favorite_item_ignored(self):
+        self.client.post(self.url, data=self.valid_data)
+        response = self.client.post(self.url, data=self.valid_data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data["results"],
+            [{"product_id": self.product.pk, "status": "exists"}],
+        )
@@ -0,0 +1,111 @@
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from products.models import Product
+from reviews.models import Review
+from reviews.services import ReviewService
+from tests.factories.addresses_factories import PickupAddressFactory
+from tests.factories.orders_factories import create_test_order
+from tests.factories.reviews_factories import ReviewFactory
+from tests.factories.store_factories import StoreFactory
+from tests.factories.products_factories import ProductFactory, InventoryFactory
+from tests.factories.auth_factories import (
+    create_customer,
+    create_distributor,
+    create_groups,
+)
+
+
+class ProductRatingsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        cls.store = StoreFactory.create(distributor=create_distributor("distributor@test.com"))
+        cls.product = ProductFactory.create()
+        cls.product2 = ProductFactory.create()
+        InventoryFactory.create(store=cls.store, product=cls.product)
+        InventoryFactory.create(store=cls.store, product=cls.product2)
+        cls.customers = []
+        for i in range(2):
+            customer = create_customer(f"customer{i}@test.com")
+            pickup_address = PickupAddressFactory.create(customer=customer)
+            for product in [cls.product, cls.product2]:
+                create_test_order(customer, pickup_address, product, 1, cls.store, "delivered")
+            cls.customers.append(customer)
+
+    def create_review(self, customer, product, rating):
+        ReviewService().create(
+            product.pk, customer.pk, rating=rating, content="review content"
+        )
+        return Review.objects.get(customer=customer, product=product)
+
+    def test_create_updates_aggregates(self):
+        self.create_review(self.customers[0], self.product, 4)
+        self.create_review(self.customers[1], self.product, 1)
+
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.ratings_count, 2)
+        self.assertEqual(product.ratings_sum, 5)
+        self.assertEqual(product.rating, Decimal("2.50"))
+        self.assertEqual(product.rating_histogram, {1: 1, 2: 0, 3: 0, 4: 1, 5: 0})
+
+    def test_update_and_delete(self):
+        review = self.create_review(self.customers[0], self.product, 4)
+        self.create_review(self.customers[1], self.product, 2)
+
+        ReviewService().update(review, rating=5)
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.rating, Decimal("3.50"))
+        self.assertEqual(product.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+
+        ReviewService().delete(review)
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.ratings_count, 1)
+        self.assertEqual(product.rating, Decimal("2.00"))
+
+        ReviewService().delete(Review.objects.get(product=self.product))
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.ratings_count, 0)
+        self.assertEqual(product.ratings_sum, 0)
+        self.assertEqual(product.rating, 0)
+
+    def test_rebuild_command(self):
+        order_date = self.product.added_at.date()
+        ReviewFactory.create(customer=self.customers[0], product=self.product, rating=5, order_date=order_date)
+        ReviewFactory.create(customer=self.customers[1], product=self.product, rating=2, order_date=order_date)
+        Product.objects.filter(pk=self.product2.pk).update(ratings_count=3, ratings_sum=9, rating=3)
+
+        out = StringIO()
+        call_command("rebuild_product_ratings", stdout=out)
+        self.assertIn("Updated 2 products", out.getvalue())
+
+        product = Product.objects.get(pk=self.product.pk)
+        self.assertEqual(product.ratings_count, 2)
+        self.assertEqual(product.rating, Decimal("3.50"))
+        self.assertEqual(product.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+        product2 = Product.objects.get(pk=self.product2.pk)
+        self.assertEqual(product2.ratings_count, 0)
+        self.assertEqual(product2.rating, 0)
+
+    def test_rating_ordering(self):
+        self.create_review(self.customers[0], self.product, 2)
+        self.create_review(self.customers[0], self.product2, 5)
+
+        response = self.client.get(
+            reverse("products:products"), QUERY_STRING="ordering=-rating"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([item["id"] for item in results], [self.product2.pk, self.product.pk])
+        self.assertEqual(results[0]["rating"], "5.00")
+        self.assertEqual(results[0]["ratings_count"], 1)
+
+    def test_product_detail_rating(self):
+        self.create_review(self.customers[0], self.product, 3)
+        response = self.client.get(reverse("products:product", kwargs={"pk": self.product.pk}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rating"], "3.00")
+        self.assertEqual(response.data["rating_histogram"][3], 1)
@@ -1,6 +1,10 @@
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
+from products.cache import product_detail_cache
+from products.services import ProductService
 from tests.factories.store_factories import StoreFactory
 from tests.factories.products_factories import (
     ProductFactory,
@@ -50,3 +54,80 @@ class ProductDetailTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+
+
+@override_settings(PRODUCT_DETAIL_CACHE_STATS=True)
+class ProductDetailCacheTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        create_groups()
+        cls.distributor = create_distributor("distributor@test.com")
+        cls.store = StoreFactory.create(distributor=cls.distributor)
+        cls.product = ProductFactory.create(
+            name="Samsung new phone", description="New phone From Samsung"
+        )
+        cls.inventory = InventoryFactory.create(store=cls.store, product=cls.product)
+        cls.cover_image = AlbumItemFactory.create(product=cls.product, is_cover=True)
+        cls.url = reverse("products:product", kwargs={'pk': cls.product.pk})
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_cache_hit(self):
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], self.product.name)
+
+        stats = product_detail_cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_cache_hit_without_queries(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["name"], self.product.name)
+
+    @override_settings(PRODUCT_DETAIL_CACHE_STATS=False)
+    def test_stats_disabled(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(product_detail_cache.stats()["hits"], 0)
+
+    def test_missing_product(self):
+        url = reverse("products:product", kwargs={"pk": self.product.pk + 100})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_invalidates_cache(self):
+        self.client.get(self.url)
+        service = ProductService()
+        service.update(self.product, self.distributor.pk, name="Samsung old phone")
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["name"], "Samsung old phone")
+        self.assertEqual(product_detail_cache.stats()["invalidations"], 1)
+
+    def test_delete_invalidates_cache(self):
+        self.client.get(self.url)
+        service = ProductService()
+        service.delete(self.product)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stats_admin_only(self):
+        url = reverse("products:product_detail_cache_stats")
+        customer = create_customer("customer@test.com")
+        customer_token = generate_auth_token(customer.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {customer_token}")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        customer.user.is_staff = True
+        customer.user.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hit_ratio", response.data)
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from tests.factories.products_factories import ProductFactory
+
+
+class ProductFacetsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.url = reverse("products:product_facets")
+        cls.product1 = ProductFactory.create(
+            name="Samsung new phone", description="New phone From Samsung", price=30
+        )
+        cls.product2 = ProductFactory.create(
+            name="Samsung old phone",
+            description="Old phone From Samsung",
+            price=700,
+            brand=cls.product1.brand,
+        )
+        cls.product3 = ProductFactory.create(
+            name="Redmi new laptop", description="New laptop From Redmi", price=750
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_unauthenticated_success(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_facet_counts(self):
+        response = self.client.get(self.url)
+
+        brands = {brand["brand_id"]: brand["count"] for brand in response.data["brands"]}
+        self.assertEqual(brands[self.product1.brand_id], 2)
+        self.assertEqual(brands[self.product3.brand_id], 1)
+        self.assertEqual(len(response.data["sub_categories"]), 3)
+
+        buckets = {bucket["min"]: bucket["count"] for bucket in response.data["price_buckets"]}
+        self.assertEqual(buckets[0], 1)
+        self.assertEqual(buckets[500], 2)
+        self.assertEqual(sum(buckets.values()), 3)
+
+    def test_search_facets(self):
+        response = self.client.get(self.url, QUERY_STRING="search=samsung")
+        self.assertEqual(len(response.data["brands"]), 1)
+        self.assertEqual(response.data["brands"][0]["count"], 2)
+
+    def test_price_range_facets(self):
+        response = self.client.get(self.url, QUERY_STRING="price__range=600,800")
+        buckets = {bucket["min"]: bucket["count"] for bucket in response.data["price_buckets"]}
+        self.assertEqual(buckets[0], 0)
+        self.assertEqual(buckets[500], 2)
+
+    def test_invalid_price_range(self):
+        response = self.client.get(self.url, QUERY_STRING="price__range=100")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,3 +1,5 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
@@ -51,6 +53,13 @@ class ProductListTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data["results"]), 1)
 
+    def test_search_reflects_product_updates(self):
+        self.product1.name = "Nokia old phone"
+        self.product1.save()
+
+        response = self.client.get(self.url, QUERY_STRING="search=nokia")
+        self.assertEqual(len(response.data["results"]), 1)
+
     def test_invalid_ordering(self):
         response = self.client.get(
             self.url, QUERY_STRING="ordering=category_id"
@@ -71,6 +80,78 @@ class ProductListTests(APITestCase):
         response = self.client.get(self.url, QUERY_STRING="price__range=-100, 1000")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_in_stock_filter(self):
+        ProductFactory.create()  # without inventory
+
+        response = self.client.get(self.url, QUERY_STRING="in_stock=true")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.product1.pk)
+
+        response = self.client.get(self.url, QUERY_STRING="in_stock=false")
+        self.assertEqual(len(response.data["results"]), 1)
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_cursor_pagination_with_equal_prices(self):
+        for _ in range(14):
+            ProductFactory.create(price=self.product1.price)
+
+        product_ids = []
+        response = self.client.get(
+            self.url, QUERY_STRING="pagination=cursor&ordering=-price"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product_ids += [product["id"] for product in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            product_ids += [product["id"] for product in response.data["results"]]
+
+        self.assertEqual(len(product_ids), 15)
+        self.assertEqual(len(set(product_ids)), 15)
+
+    def test_cursor_pagination_with_search(self):
+        for i in range(14):
+            # varying ranks with ties between the products of the same text
+            ProductFactory.create(
+                name="Samsung new phone" if i % 2 else f"Samsung phone {i}",
+                description="New phone From Samsung" + " phone" * (i % 3),
+            )
+
+        product_ids = []
+        response = self.client.get(
+            self.url, QUERY_STRING="pagination=cursor&search=samsung"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        product_ids += [product["id"] for product in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            product_ids += [product["id"] for product in response.data["results"]]
+
+        self.assertEqual(len(product_ids), 15)
+        self.assertEqual(len(set(product_ids)), 15)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, QUERY_STRING="cursor=invalid")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_queries_independent_of_page_size(self):
+        with CaptureQueriesContext(connection) as single_product_queries:
+            self.client.get(self.url)
+
+        for _ in range(5):
+            product = ProductFactory.create()
+            AlbumItemFactory.create(product=product, is_cover=True)
+
+        with CaptureQueriesContext(connection) as many_products_queries:
+            response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data["results"]), 6)
+        self.assertEqual(
+            len(many_products_queries.captured_queries),
+            len(single_product_queries.captured_queries),
+        )
+
 
 class CategoryProductListTests(APITestCase):
     @classmethod
@@ -103,6 +184,19 @@ class CategoryProductListTests(APITestCase):
         response = self.client.get(self.url)
         self.assertEqual(len(response.data['results']), 1)
 
+    def test_category_follows_sub_category(self):
+        sub_category = self.product2.sub_category
+        sub_category.category_id = self.category_id1
+        sub_category.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 2)
+
+        self.product1.sub_category = sub_category
+        self.product1.save()
+        self.product1.refresh_from_db()
+        self.assertEqual(self.product1.category_id, self.category_id1)
+
     def test_role_independent(self):
         distributor_token = generate_auth_token(self.distributor.user)
         self.client.credentials(HTTP_AUTHORIZATION=f"Token {distributor_token}")
@@ -0,0 +1,65 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from products.services import suggestions_cache
+from tests.factories.brand_related_factories import BrandFactory
+from tests.factories.products_factories import ProductFactory
+
+
+class SuggestionListTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.url = reverse("products:suggestions")
+        cls.brand = BrandFactory.create(name="Samsung")
+        cls.product1 = ProductFactory.create(name="Samsung Galaxy phone")
+        cls.product2 = ProductFactory.create(name="Phone cover for Samsung")
+        cls.product3 = ProductFactory.create(name="Redmi note")
+        cls.removed_product = ProductFactory.create(name="Samsung tablet", is_active=False)
+
+    def setUp(self) -> None:
+        suggestions_cache.clear()
+
+    def test_unauthenticated_success(self):
+        response = self.client.get(self.url, QUERY_STRING="prefix=sam")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_missing_prefix_failure(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_prefix_matches(self):
+        response = self.client.get(self.url, QUERY_STRING="prefix=SAM")
+        product_ids = [product["id"] for product in response.data["products"]]
+        # names starting with the prefix come first
+        self.assertEqual(product_ids, [self.product1.pk, self.product2.pk])
+        self.assertEqual(response.data["brands"], [{"id": self.brand.pk, "name": "Samsung"}])
+
+    def test_limit(self):
+        response = self.client.get(self.url, QUERY_STRING="prefix=sam&limit=1")
+        self.assertEqual(len(response.data["products"]), 1)
+
+    def test_cached_prefix(self):
+        self.client.get(self.url, QUERY_STRING="prefix=redmi")
+        ProductFactory.create(name="Redmi watch")
+
+        response = self.client.get(self.url, QUERY_STRING="prefix=redmi")
+        self.assertEqual(len(response.data["products"]), 1)
+
+        suggestions_cache.clear()
+        response = self.client.get(self.url, QUERY_STRING="prefix=redmi")
+        self.assertEqual(len(response.data["products"]), 2)
+
+    def test_words_prefix_matches(self):
+        response = self.client.get(self.url, QUERY_STRING="prefix=cover for sa")
+        product_ids = [product["id"] for product in response.data["products"]]
+        self.assertEqual(product_ids, [self.product2.pk])
+
+        # a word only matches from its start
+        response = self.client.get(self.url, QUERY_STRING="prefix=over")
+        self.assertEqual(response.data["products"], [])
+
+    def test_quoted_prefix(self):
+        product = ProductFactory.create(name="Kid's o'clock watch")
+        response = self.client.get(self.url, QUERY_STRING="prefix=o'cl")
+        product_ids = [product["id"] for product in response.data["products"]]
+        self.assertEqual(product_ids, [product.pk])
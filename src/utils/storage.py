@@ -1,30 +1,98 @@
+import hashlib
+import threading
+import time
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files import File
+from django.utils.module_loading import import_string
 from supabase import create_client
 
 
-class SupabaseStorageService:
+_client = None
+_client_lock = threading.Lock()
 
-    def __init__(self) -> None:
-        url = settings.SUPABASE_URL
-        key = settings.SUPABASE_KEY
-        self.client = create_client(url, key)
 
-    
+def get_storage_client():
+    """Return the process wide supabase client, it is built on first use and
+    shared so its HTTP connections are reused across requests"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return _client
+
+
+def get_storage_service():
+    return import_string(settings.STORAGE_SERVICE)()
+
+
+class StorageService:
+    """
+    Base storage service, signed urls are cached until shortly before their
+    signature expires (see SIGNED_URL_EXPIRY_MARGIN).
+    """
+
+    signed_url_key_prefix = "signed_url"
+
+    def upload(self, file: File, bucket: str, path: str='', file_options=None):
+        raise NotImplementedError
+
+    def create_signed_url(self, bucket: str, path: str, duration: int) -> str:
+        raise NotImplementedError
+
+    def get_url(self, bucket, path, duration):
+        key = self._signed_url_key(bucket, path, duration)
+        url = cache.get(key)
+        if url is not None:
+            return url
+
+        try:
+            url = self.create_signed_url(bucket, path, duration)
+        except Exception:
+            return None
+
+        timeout = int(duration) - settings.SIGNED_URL_EXPIRY_MARGIN
+        if timeout > 0:
+            cache.set(key, url, timeout)
+        return url
+
+    def _signed_url_key(self, bucket, path, duration) -> str:
+        path_hash = hashlib.md5(f"{bucket}/{path}".encode("utf-8")).hexdigest()
+        return f"{self.signed_url_key_prefix}:{path_hash}:{int(duration)}"
+
+
+class SupabaseStorageService(StorageService):
+
+    @property
+    def client(self):
+        return get_storage_client()
+
     def upload(self, file: File, bucket: str, path: str='', file_options=None):
         if not path:
             path = file.name
         with file as f:
             file_content = f.read()
             self.client.storage.from_(bucket).upload(file=file_content, path=path, file_options=file_options)
-    
-    def get_url(self, bucket, path, duration):
-        try:
-            response = self.client.storage.from_(bucket).create_signed_url(path, duration)
-            url = response['signedURL']
-        except:
-            url = None
-        return url
 
+    def create_signed_url(self, bucket, path, duration):
+        response = self.client.storage.from_(bucket).create_signed_url(path, duration)
+        return response['signedURL']
 
 
+class LocalStorageService(StorageService):
+    """In memory storage for tests and local development"""
+
+    files = {}
+
+    def upload(self, file: File, bucket: str, path: str='', file_options=None):
+        if not path:
+            path = file.name
+        with file as f:
+            self.files[(bucket, path)] = f.read()
+
+    def create_signed_url(self, bucket, path, duration):
+        if (bucket, path) not in self.files:
+            raise FileNotFoundError(path)
+        expires = int(time.time() + duration)
+        return f"/local-storage/{bucket}/{path}?expires={expires}"